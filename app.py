@@ -1,28 +1,80 @@
 import streamlit as st
 import pandas as pd
+import time
 import httpx  # ✅ Used to call FastAPI backend
 
 st.set_page_config(page_title="Research Supervisor AI", layout="wide")
 st.title("🔍 Research Supervisor AI")
 query = st.text_input("Enter a topic:", "")
 
-def fetch_results(query):
-    """Calls FastAPI backend to fetch research results."""
+BACKEND_URL = "http://127.0.0.1:8000"
+POLL_WAIT = 25  # seconds the backend holds each long-poll open
+RESEARCH_DEADLINE = 360  # give up waiting after this long (the backend's job timeout is 300s, plus queueing)
+
+@st.cache_data(ttl=300)
+def fetch_sources():
+    """The backend's source registry (GET /sources), as {name: source}."""
+    response = httpx.get(f"{BACKEND_URL}/sources")
+    response.raise_for_status()
+    return {source["name"]: source for source in response.json()}
+
+try:
+    SOURCES = fetch_sources()
+except httpx.HTTPError as e:
+    st.error(f"❌ Could not load sources from the backend at {BACKEND_URL}: {e}")
+    st.stop()
+
+def source_label(name):
+    source = SOURCES.get(name, {})
+    return f"{source.get('icon', '🔎')} {name}" + ("" if source.get("enabled", True) else " (not configured)")
+
+# Sources without an API key on the backend always come back empty, so they start unselected
+selected = st.multiselect(
+    "Sources:", list(SOURCES), default=[name for name, source in SOURCES.items() if source.get("enabled", True)],
+    format_func=source_label,
+)
+
+def fetch_results(query, sources):
+    """Queues a research job on the FastAPI backend and long-polls until its report is ready."""
     with st.spinner(f"🔍 Researching '{query}'..."):
-        response = httpx.get(f"http://127.0.0.1:8000/search/?query={query}")
-        return response.json() if response.status_code == 200 else None
+        response = httpx.post(f"{BACKEND_URL}/research", json={"query": query, "sources": ",".join(sources)})
+        if response.status_code != 202:
+            return None
+        job = response.json()
+        job_url = f"{BACKEND_URL}{job['url']}"
+        deadline = time.monotonic() + RESEARCH_DEADLINE
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                # e.g. no backend process runs job workers (JOB_WORKERS=0), so the job never leaves the queue
+                st.error(f"⏱️ Research job {job['id']} is still {job['status']} after {RESEARCH_DEADLINE}s.")
+                return None
+            wait = min(POLL_WAIT, remaining)
+            response = httpx.get(job_url, params={"wait": wait}, timeout=wait + 10)
+            if response.status_code != 200:
+                return None
+            job = response.json()
+            if job["status"] == "done":
+                return job["result"]
+            if job["status"] == "failed":
+                st.error(f"Research failed: {job['error']}")
+                return None
 
-if st.button("Start Research") and query:
-    data = fetch_results(query)
+if st.button("Start Research") and query and selected:
+    data = fetch_results(query, selected)
 
     if data:
         st.subheader("📄 Final Research Summary")
         st.markdown(data["final_response"])
 
-        tab_titles = ["📢 Reddit", "🌍 Tavily", "📺 YouTube", "📖 Wikipedia", "📰 Hacker News", "🗞️ NewsAPI", "📄 Arxiv"]
+        sources = list(data["raw_results"])
+        tab_titles = [f"{SOURCES.get(source, {}).get('icon', '🔎')} {source}" for source in sources]
         tabs = st.tabs(tab_titles)
 
         def display_results(source, results):
+            if isinstance(results, dict) and "status" in results:
+                st.warning(f"{source} is unavailable right now ({results['status']}).")
+                return
             if not results:
                 st.warning(f"No results found for {source}.")
                 return
@@ -32,5 +84,5 @@ if st.button("Start Research") and query:
             else:
                 st.write(df)
 
-        for i, source in enumerate(tab_titles):
+        for i, source in enumerate(sources):
             with tabs[i]: display_results(source, data["raw_results"][source])
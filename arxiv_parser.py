@@ -0,0 +1,79 @@
+import xml.etree.ElementTree as ET
+
+ATOM = "{http://www.w3.org/2005/Atom}"
+CHUNK_SIZE = 64 * 1024
+
+
+def _text(elem, tag):
+    child = elem.find(ATOM + tag)
+    if child is None or child.text is None:
+        return ""
+    return " ".join(child.text.split())
+
+
+def _entry_to_paper(entry):
+    pdf_url = ""
+    for link in entry.iter(ATOM + "link"):
+        if link.get("title") == "pdf" or link.get("type") == "application/pdf":
+            pdf_url = link.get("href", "")
+            break
+
+    return {
+        "title": _text(entry, "title"),
+        "url": _text(entry, "id"),
+        "abstract": _text(entry, "summary"),
+        "authors": [_text(author, "name") for author in entry.iter(ATOM + "author")],
+        "published": _text(entry, "published"),
+        "pdf_url": pdf_url,
+    }
+
+
+class ArxivFeedParser:
+    """Incremental Atom parser for arXiv API responses.
+
+    Feed it bytes as they arrive; each call returns the entries completed so
+    far. Finished <entry> elements are cleared as soon as they are read, so
+    memory stays bounded by the chunk size rather than the feed size.
+    """
+
+    def __init__(self, max_entries=None):
+        self.max_entries = max_entries
+        self.count = 0
+        self._parser = ET.XMLPullParser(events=("end",))
+
+    @property
+    def done(self):
+        return self.max_entries is not None and self.count >= self.max_entries
+
+    def _drain(self):
+        papers = []
+        for _, elem in self._parser.read_events():
+            if elem.tag != ATOM + "entry" or self.done:
+                continue
+            papers.append(_entry_to_paper(elem))
+            self.count += 1
+            elem.clear()
+        return papers
+
+    def feed(self, chunk):
+        """Parses another chunk of the feed and returns any newly completed entries."""
+        if self.done:
+            return []
+        self._parser.feed(chunk)
+        return self._drain()
+
+    def close(self):
+        """Flushes the parser and returns any remaining entries."""
+        self._parser.close()
+        return self._drain()
+
+
+def parse_arxiv_feed(data, max_entries=None):
+    """Parses a complete arXiv Atom response (bytes or str) into paper dicts, chunk by chunk."""
+    parser = ArxivFeedParser(max_entries)
+    papers = []
+    for start in range(0, len(data), CHUNK_SIZE):
+        papers += parser.feed(data[start:start + CHUNK_SIZE])
+        if parser.done:
+            return papers
+    return papers + parser.close()
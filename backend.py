@@ -1,10 +1,78 @@
-from fastapi import FastAPI
+import json
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import List, Optional
+from fastapi import FastAPI, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
 import asyncio
-from supervisor import run_supervisor_flow
+from dedup import dedup_results
+from supervisor import (
+    run_supervisor_flow, source_flights, iter_agent_results, stream_report, llm_gateway, summary_gateway, warm_up,
+    SYNTHESIS_MODE, MapStep, revalidate, lookup_report,
+)
+from http_client import open_http_client, close_http_client
+from reddit import reddit_client
+from cache import result_cache, normalize_query
+from singleflight import SingleFlight
+from resilience import resilience_stats
+from ratelimit import rate_limiter
+from semantic_cache import report_cache
+from sources import SOURCES, resolve_sources, parse_source_names
+from batch import BatchLimits, BATCH_MAX_QUERIES
+from executors import executor_stats, shutdown_executors
+from jobs import job_store, JobWorkers
+from prewarm import PrewarmScheduler, query_popularity
+from tools import wikipedia_pages
+from telemetry import tracer, watch_executor
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 from fastapi.middleware.cors import CORSMiddleware
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Opens shared upstream clients on startup and closes them on shutdown."""
+    await open_http_client()
+    # asyncio.to_thread's pool, made explicit so /metrics can report its backlog
+    executor = ThreadPoolExecutor(thread_name_prefix="to_thread")
+    asyncio.get_running_loop().set_default_executor(executor)
+    watch_executor("default", executor)
+    llm_gateway.start_lag_monitor()
+    # Heavy SDKs load in the background so the worker accepts requests immediately
+    warm_up_task = asyncio.create_task(warm_up())
+    job_workers.start()
+    prewarm_scheduler.start()
+    yield
+    await prewarm_scheduler.stop()
+    # Jobs still running go back to the queue for another worker or the next start
+    await job_workers.stop()
+    warm_up_task.cancel()
+    await llm_gateway.stop_lag_monitor()
+    await reddit_client.close()
+    await close_http_client()
+    shutdown_executors()
+    result_cache.close()
+    rate_limiter.close()
+    job_store.close()
+
+# ✅ Identical in-flight searches share one supervisor run
+search_flights = SingleFlight("search")
+
+def search_key(query, budget, names):
+    return f"{normalize_query(query)}|{budget}|{','.join(sorted(names or SOURCES))}"
+
+async def run_job(job):
+    """Runs one queued research job, sharing the run with identical /search/ requests in flight."""
+    key = search_key(job["query"], job["budget"], job["sources"])
+    return await search_flights.do(key, lambda: run_supervisor_flow(job["query"], job["budget"], job["sources"]))
+
+# ✅ Keeps this worker's most requested topics researched before their reports expire
+prewarm_scheduler = PrewarmScheduler(query_popularity, report_cache.expires_at, revalidate)
+
+# ✅ Background workers for POST /research (JOB_WORKERS=0 leaves this process serving requests only)
+job_workers = JobWorkers(job_store, run_job)
+
 # ✅ Initialize FastAPI
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 # ✅ Allow Streamlit to communicate with FastAPI
 app.add_middleware(
@@ -15,18 +83,207 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+def selected_sources(sources):
+    """Validates the `sources=` parameter, returning canonical names (or None for all)."""
+    names = parse_source_names(sources)
+    try:
+        resolve_sources(names)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return names
+
+SOURCES_QUERY = Query(None, description="Comma-separated source names to run (default: all)")
+BUDGET_QUERY = Query(None, gt=0, description="Fan-out latency budget in seconds")
+
+def server_timing(timings):
+    """Formats stage timings (seconds) as a Server-Timing header value in milliseconds."""
+    return ", ".join(f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in timings.items())
+
 @app.get("/search/")
-async def search(query: str):
+async def search(
+    query: str, response: Response, budget: Optional[float] = BUDGET_QUERY, sources: Optional[str] = SOURCES_QUERY
+):
     """Runs research query and returns structured results."""
     print(f"🔍 Searching for '{query}'...")
+    names = selected_sources(sources)
 
     # ✅ Run the research supervisor
-    results = await run_supervisor_flow(query)
+    key = search_key(query, budget, names)
+    with tracer.start_as_current_span("search", attributes={"query": query, "sources": ",".join(names or SOURCES)}):
+        results = await search_flights.do(key, lambda: run_supervisor_flow(query, budget, names))
+    response.headers["Server-Timing"] = server_timing(results["timings"])
 
-    return {
+    body = {
         "final_response": results["final_response"],
         "raw_results": results["raw_results"]
     }
+    if results.get("stale"):
+        body["stale"] = True
+    return body
+
+def sse_event(event, data):
+    """Formats one Server-Sent Events frame."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@app.get("/search/stream")
+async def search_stream(query: str, budget: Optional[float] = BUDGET_QUERY, sources: Optional[str] = SOURCES_QUERY):
+    """Streams each source as it finishes, then the report token by token, then a final `done` event."""
+    print(f"🔍 Streaming search for '{query}'...")
+    names = selected_sources(sources)
+
+    async def events():
+        raw_results, mapper = {}, None
+        try:
+            cached = await lookup_report(query, names)
+            if cached is not None:
+                for source, results in cached["raw_results"].items():
+                    yield sse_event("source", {"source": source, "results": results})
+                yield sse_event("token", {"text": cached["final_response"]})
+                yield sse_event("done", cached)
+                return
+
+            if SYNTHESIS_MODE == "map_reduce":
+                mapper = MapStep(query, len(resolve_sources(names)))
+            async for source, results in iter_agent_results(query, budget, names):
+                raw_results[source] = results
+                if mapper is not None:
+                    mapper.add(source, results)
+                yield sse_event("source", {"source": source, "results": results})
+
+            summaries = await mapper.summaries() if mapper is not None else None
+            fetched, raw_results = raw_results, dedup_results(raw_results)
+            report = []
+            async for token in stream_report(query, raw_results, summaries):
+                report.append(token)
+                yield sse_event("token", {"text": token})
+
+            response = {"final_response": "".join(report), "raw_results": raw_results}
+            report_cache.store(query, names, fetched, response)
+            yield sse_event("done", response)
+
+        except Exception as e:
+            print(f"❌ Streaming search failed: {e}")
+            yield sse_event("error", {"message": str(e)})
+        finally:
+            if mapper is not None:
+                mapper.cancel()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+class BatchRequest(BaseModel):
+    queries: List[str] = Field(..., min_length=1, max_length=BATCH_MAX_QUERIES)
+    budget: Optional[float] = Field(None, gt=0, description="Per-source latency budget in seconds")
+    sources: Optional[str] = Field(None, description="Comma-separated source names to run (default: all)")
+
+@app.post("/search/batch")
+async def search_batch(request: BatchRequest):
+    """Researches many queries under shared concurrency caps, streaming one JSON line per query as it completes."""
+    print(f"🔍 Batch search for {len(request.queries)} queries...")
+    names = selected_sources(request.sources)
+
+    # ✅ Queries that normalize the same run once and answer every position they appear at
+    positions = {}
+    for index, query in enumerate(request.queries):
+        positions.setdefault(normalize_query(query), []).append(index)
+
+    async def lines():
+        limits = BatchLimits()
+
+        async def research(query):
+            async with limits.queries:
+                return await run_supervisor_flow(query, request.budget, names, limits)
+
+        pending = {
+            asyncio.create_task(research(request.queries[indexes[0]])): indexes
+            for indexes in positions.values()
+        }
+        try:
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    indexes = pending.pop(task)
+                    try:
+                        body = task.result()
+                    except Exception as e:
+                        print(f"❌ Batch query '{request.queries[indexes[0]]}' failed: {e}")
+                        body = {"error": str(e)}
+                    for index in indexes:
+                        yield json.dumps({"index": index, "query": request.queries[index], **body}) + "\n"
+        finally:
+            for task in pending:
+                task.cancel()
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+class ResearchRequest(BaseModel):
+    query: str = Field(..., min_length=1)
+    budget: Optional[float] = Field(None, gt=0, description="Fan-out latency budget in seconds")
+    sources: Optional[str] = Field(None, description="Comma-separated source names to run (default: all)")
+
+@app.post("/research", status_code=202)
+async def submit_research(request: ResearchRequest):
+    """Queues a research job and returns its ID right away; poll GET /research/{id} for the report."""
+    names = selected_sources(request.sources)
+    job_id = await job_store.submit(request.query, request.budget, names)
+    print(f"🔍 Queued research job {job_id} for '{request.query}'")
+    return {"id": job_id, "status": "queued", "url": f"/research/{job_id}"}
+
+@app.get("/research/{job_id}")
+async def get_research(job_id: str, wait: float = Query(0, ge=0, le=60, description="Seconds to wait for the job to finish")):
+    """Returns a research job's status, and its result once done. With `wait`, long-polls until it finishes."""
+    job = await job_store.get(job_id, wait)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown research job {job_id}")
+    return job
+
+@app.get("/sources")
+async def list_sources():
+    """Lists the registered sources with their mode, cost and defaults."""
+    return [
+        {
+            "name": source.name,
+            "icon": source.icon,
+            "async": source.is_async,
+            "cost": source.cost,
+            "num_results": source.num_results,
+            "enabled": source.enabled,
+        }
+        for source in SOURCES.values()
+    ]
+
+@app.get("/stats")
+async def stats():
+    """Exposes cache, request-coalescing, LLM gateway, per-source resilience and source pool counters for monitoring."""
+    return {
+        "cache": result_cache.stats(),
+        "sources": resilience_stats(),
+        "llm": llm_gateway.stats(),
+        "llm_summary": summary_gateway.stats(),
+        "report_cache": report_cache.stats(),
+        "wikipedia_pages": wikipedia_pages.stats(),
+        "executors": executor_stats(),
+        "jobs": await job_store.stats(),
+        "prewarm": prewarm_scheduler.stats(),
+        "singleflight": {
+            "search": search_flights.stats(),
+            "source": source_flights.stats(),
+        },
+    }
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics: per-source and per-stage latency, failures, cache hits, model calls and tokens,
+    thread-pool backlog and event-loop lag."""
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+@app.get("/quota")
+async def quota():
+    """Reports rate-limit tokens and daily quota usage per limited source."""
+    return await rate_limiter.quotas()
 
 # ✅ Run FastAPI with:
 # uvicorn backend:app --reload
@@ -0,0 +1,43 @@
+import asyncio
+import os
+from dotenv import load_dotenv
+
+# ✅ Load environment variables
+load_dotenv()
+
+# ✅ Batch caps: queries researched at once, source calls at once, and source calls per source
+# (override one source with e.g. BATCH_SOURCE_CONCURRENCY_YOUTUBE=1)
+BATCH_MAX_QUERIES = int(os.getenv("BATCH_MAX_QUERIES", "500"))
+BATCH_QUERY_CONCURRENCY = int(os.getenv("BATCH_QUERY_CONCURRENCY", "8"))
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "16"))
+BATCH_SOURCE_CONCURRENCY = int(os.getenv("BATCH_SOURCE_CONCURRENCY", "4"))
+
+
+def source_concurrency(source):
+    env_name = "BATCH_SOURCE_CONCURRENCY_" + source.upper().replace(" ", "_")
+    return int(os.getenv(env_name, BATCH_SOURCE_CONCURRENCY))
+
+
+class BatchLimits:
+    """Concurrency caps shared by every query in one batch.
+
+    Each source call waits for a slot for its source, then a global slot,
+    before it starts, so its deadline only counts once it is actually
+    running. The per-source slot comes first so calls queued behind a
+    capped or slow source never hold global slots other sources could use.
+    """
+
+    def __init__(self, concurrency=BATCH_CONCURRENCY, query_concurrency=BATCH_QUERY_CONCURRENCY):
+        self.queries = asyncio.Semaphore(query_concurrency)
+        self._total = asyncio.Semaphore(concurrency)
+        self._per_source = {}
+
+    def _source_slots(self, source):
+        if source not in self._per_source:
+            self._per_source[source] = asyncio.Semaphore(source_concurrency(source))
+        return self._per_source[source]
+
+    async def run(self, source, call):
+        """Runs `call()` once a slot for `source` and a global slot are free."""
+        async with self._source_slots(source), self._total:
+            return await call()
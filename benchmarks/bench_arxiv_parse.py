@@ -0,0 +1,81 @@
+"""Microbenchmark: streaming Atom parser vs. the old split-based Arxiv parser.
+
+Scales the sample feed in fixtures/arxiv_feed.xml up to large entry counts and
+reports time per parse plus peak traced memory for each approach.
+
+Run from the repo root:
+    python benchmarks/bench_arxiv_parse.py
+"""
+import os
+import re
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from arxiv_parser import ArxivFeedParser, parse_arxiv_feed  # noqa: E402
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "arxiv_feed.xml")
+SIZES = (5, 100, 1000, 5000)
+CHUNK_SIZE = 16 * 1024
+
+
+def split_parser(text, num_results):
+    """The original tools.search_arxiv parsing logic, kept here as the baseline."""
+    data = text.split("<entry>")
+    papers = []
+
+    for entry in data[1:num_results+1]:
+        title = entry.split("<title>")[1].split("</title>")[0].strip()
+        link = entry.split("<id>")[1].split("</id>")[0].strip()
+        papers.append({"title": title, "url": link})
+
+    return papers
+
+
+def scaled_feed(size):
+    """Repeats the fixture's entries until the feed holds `size` of them."""
+    with open(FIXTURE, "rb") as f:
+        raw = f.read()
+    entries = re.findall(rb"<entry>.*?</entry>", raw, re.S)
+    head = raw[:raw.index(b"<entry>")]
+    tail = raw[raw.rindex(b"</entry>") + len(b"</entry>"):]
+    repeated = [entries[i % len(entries)] for i in range(size)]
+    return head + b"\n".join(repeated) + tail
+
+
+def streamed(feed, size):
+    parser = ArxivFeedParser(size)
+    papers = []
+    for start in range(0, len(feed), CHUNK_SIZE):
+        papers += parser.feed(feed[start:start + CHUNK_SIZE])
+        if parser.done:
+            return papers
+    return papers + parser.close()
+
+
+def measure(label, func, number):
+    seconds = min(timeit.repeat(func, number=number, repeat=5)) / number
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {label:<22} {seconds * 1000:9.3f} ms   peak {peak / 1024:9.1f} KiB")
+
+
+def main():
+    for size in SIZES:
+        feed = scaled_feed(size)
+        number = max(1, 2000 // size)
+        assert len(parse_arxiv_feed(feed, size)) == size
+
+        print(f"{size} entries ({len(feed) / 1024:.0f} KiB)")
+        measure("split (baseline)", lambda: split_parser(feed.decode("utf-8"), size), number)
+        measure("pull parser, whole", lambda: parse_arxiv_feed(feed, size), number)
+        measure("pull parser, chunked", lambda: streamed(feed, size), number)
+        measure("pull parser, first 5", lambda: streamed(feed, 5), number)
+
+
+if __name__ == "__main__":
+    main()
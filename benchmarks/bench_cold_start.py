@@ -0,0 +1,97 @@
+"""Cold-start benchmark: module import time and first-request latency for a fresh worker.
+
+Each measurement runs in a new interpreter so nothing is already imported.
+The first-request run swaps the upstream sources and chat model for instant
+fakes, so it measures only our own startup and first-call overhead, offline.
+
+Run from the repo root:
+    python benchmarks/bench_cold_start.py [--runs 5]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_SNIPPET = """
+import json, time
+started = time.perf_counter()
+import {module}
+print(json.dumps({{"seconds": time.perf_counter() - started}}))
+"""
+
+FIRST_REQUEST_SNIPPET = """
+import asyncio, json, time
+started = time.perf_counter()
+import backend
+import supervisor
+from sources import SOURCES
+imported = time.perf_counter()
+
+class FakeMessage:
+    content = "report"
+    usage_metadata = None
+
+class FakeModel:
+    async def ainvoke(self, prompt):
+        return FakeMessage()
+
+supervisor.llm_gateway._model_factory = lambda: FakeModel()
+supervisor.source_calls = lambda query, sources=None, min_ttl=0: {
+    name: (lambda: asyncio.sleep(0, result=[{"title": "t", "url": "u"}])) for name in SOURCES
+}
+supervisor.warm_up = lambda: asyncio.sleep(0)
+backend.warm_up = supervisor.warm_up
+
+from fastapi.testclient import TestClient
+with TestClient(backend.app) as client:
+    ready = time.perf_counter()
+    response = client.get("/search/", params={"query": "cold start"})
+    response.raise_for_status()
+    first = time.perf_counter()
+
+print(json.dumps({
+    "import": imported - started,
+    "startup": ready - imported,
+    "first_request": first - ready,
+    "ready_total": ready - started,
+}))
+"""
+
+
+def run_snippet(code):
+    # Throwaway stores, and no job workers starting inside the timed startup
+    env = dict(
+        os.environ, RESULT_CACHE_PATH=":memory:", RATE_LIMIT_PATH=":memory:", JOB_STORE_PATH=":memory:", JOB_WORKERS="0"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def report(label, samples):
+    print(f"  {label:<26} median {statistics.median(samples) * 1000:8.1f} ms   min {min(samples) * 1000:8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    print("Import time (fresh interpreter)")
+    for module in ("supervisor", "backend"):
+        samples = [run_snippet(IMPORT_SNIPPET.format(module=module))["seconds"] for _ in range(args.runs)]
+        report(f"import {module}", samples)
+
+    print("Worker boot and first /search/ (fake sources and model)")
+    runs = [run_snippet(FIRST_REQUEST_SNIPPET) for _ in range(args.runs)]
+    for key in ("import", "startup", "ready_total", "first_request"):
+        report(key, [run[key] for run in runs])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""Load test: drives /search/ at a fixed request rate against the offline stub upstreams.
+
+Starts benchmarks/stub_upstreams.py and a uvicorn backend pointed at it
+(unless --url targets one that is already running), sends requests on an
+open-loop schedule so a slow backend cannot slow the offered load down, and
+reports throughput plus p50/p95/p99 latency for the whole request and for
+each stage the backend reports in its Server-Timing header.
+
+Run from the repo root:
+    python benchmarks/loadgen.py --rate 5 --duration 30
+    python benchmarks/loadgen.py --rate 20 --queries 50      # repeat queries from a pool of 50 (exercises caches)
+    STUB_ERROR_RATE=0.05 python benchmarks/loadgen.py        # inject upstream failures
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from stub_upstreams import upstream_env  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TOPICS = "ai agents,rust async,quantum error correction,llm inference,vector databases,edge computing".split(",")
+
+
+def percentile(samples, pct):
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def parse_server_timing(header):
+    """Parses "stage;dur=12.3, other;dur=4" into {stage: seconds}."""
+    stages = {}
+    for part in filter(None, (p.strip() for p in (header or "").split(","))):
+        name, _, params = part.partition(";")
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "dur":
+                stages[name.strip()] = float(value) / 1000
+    return stages
+
+
+def backend_env(host, stub_port, workdir, keep_rate_limits):
+    env = dict(os.environ, **upstream_env(host, stub_port))
+    env.setdefault("RESULT_CACHE_PATH", os.path.join(workdir, "result_cache.sqlite3"))
+    env.setdefault("RATE_LIMIT_PATH", os.path.join(workdir, "rate_limits.sqlite3"))
+    env.setdefault("JOB_STORE_PATH", os.path.join(workdir, "jobs.sqlite3"))
+    if not keep_rate_limits:
+        # The stubs have no quota; the production limits would only measure the limiter
+        for source in ("NEWSAPI", "YOUTUBE", "REDDIT"):
+            env.setdefault(f"RATE_LIMIT_{source}_RATE", "100000")
+            env.setdefault(f"RATE_LIMIT_{source}_BURST", "100000")
+            env.setdefault(f"RATE_LIMIT_{source}_DAILY", "none")
+    return env
+
+
+def wait_for_port(host, port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with socket.socket() as sock:
+            if sock.connect_ex((host, port)) == 0:
+                return
+        time.sleep(0.1)
+    raise RuntimeError(f"nothing listening on {host}:{port} after {timeout}s")
+
+
+async def one_request(client, url, query, samples):
+    started = time.perf_counter()
+    try:
+        response = await client.get(url, params={"query": query})
+        elapsed = time.perf_counter() - started
+        samples.append({
+            "ok": response.status_code == 200,
+            "status": response.status_code,
+            "latency": elapsed,
+            "stages": parse_server_timing(response.headers.get("server-timing")),
+        })
+    except httpx.HTTPError as e:
+        samples.append({"ok": False, "status": type(e).__name__, "latency": time.perf_counter() - started, "stages": {}})
+
+
+async def drive(base_url, rate, duration, pool, poisson, timeout):
+    """Sends rate * duration requests on schedule, then waits for the stragglers."""
+    queries = [f"{random.choice(TOPICS)} {i}" for i in range(pool)] if pool else None
+    total = int(rate * duration)
+    samples, tasks = [], []
+    async with httpx.AsyncClient(timeout=timeout, limits=httpx.Limits(max_connections=None)) as client:
+        started = time.perf_counter()
+        next_at = started
+        for i in range(total):
+            next_at += random.expovariate(rate) if poisson else 1 / rate
+            await asyncio.sleep(max(0, next_at - time.perf_counter()))
+            query = random.choice(queries) if queries else f"{random.choice(TOPICS)} {i}"
+            tasks.append(asyncio.create_task(one_request(client, f"{base_url}/search/", query, samples)))
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - started
+        stats = (await client.get(f"{base_url}/stats")).json()
+    return samples, elapsed, stats
+
+
+def summarize(samples, elapsed, stats, rate):
+    ok = [s for s in samples if s["ok"]]
+    stage_names = sorted({stage for s in ok for stage in s["stages"]})
+    stages = {"request": [s["latency"] for s in ok]}
+    stages.update({name: [s["stages"][name] for s in ok if name in s["stages"]] for name in stage_names})
+    errors = {}
+    for s in samples:
+        if not s["ok"]:
+            errors[str(s["status"])] = errors.get(str(s["status"]), 0) + 1
+    return {
+        "offered_rate": rate,
+        "requests": len(samples),
+        "ok": len(ok),
+        "errors": errors,
+        "throughput": len(ok) / elapsed if elapsed else 0,
+        "latency": {
+            name: {f"p{p}": percentile(values, p) for p in (50, 95, 99)} | {"count": len(values)}
+            for name, values in stages.items()
+        },
+        "sources": {name: source.get("latency_p95") for name, source in stats.get("sources", {}).items()},
+        "source_failures": {name: source.get("failures") for name, source in stats.get("sources", {}).items()},
+        "executors": stats.get("executors", {}),
+    }
+
+
+def report(summary):
+    print(f"\nOffered {summary['offered_rate']:.1f} req/s, completed {summary['ok']}/{summary['requests']} "
+          f"({summary['throughput']:.2f} req/s)")
+    if summary["errors"]:
+        print(f"  errors: {summary['errors']}")
+    print(f"  {'stage':<14}{'p50':>10}{'p95':>10}{'p99':>10}   (ms)")
+    for name, values in summary["latency"].items():
+        cells = "".join(f"{(values[p] or 0) * 1000:10.1f}" for p in ("p50", "p95", "p99"))
+        print(f"  {name:<14}{cells}")
+    if summary["sources"]:
+        print("  per-source p95 (ms, from /stats): " + ", ".join(
+            f"{name} {p95 * 1000:.0f}" if p95 is not None else f"{name} n/a" for name, p95 in summary["sources"].items()
+        ))
+    for name, pool in summary["executors"].items():
+        wait = f"{pool['wait_p95'] * 1000:.0f}" if pool["wait_p95"] is not None else "n/a"
+        print(f"  {name} pool: {pool['completed']} completed, {pool['dropped']} dropped, {pool['shed']} shed, "
+              f"wait p95 {wait} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rate", type=float, default=5, help="requests per second to offer")
+    parser.add_argument("--duration", type=float, default=20, help="seconds to keep sending")
+    parser.add_argument("--queries", type=int, default=0, help="draw queries from a pool of this size (0: all unique)")
+    parser.add_argument("--poisson", action="store_true", help="exponential inter-arrival times instead of fixed")
+    parser.add_argument("--url", help="target an already running backend instead of starting one")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765, help="port for the backend this script starts")
+    parser.add_argument("--stub-port", type=int, default=9100, help="first of the stub upstream ports")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers for the backend")
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--keep-rate-limits", action="store_true", help="keep the production per-source rate limits")
+    parser.add_argument("--json", help="also write the summary to this file")
+    args = parser.parse_args()
+
+    processes = []
+    try:
+        if args.url:
+            base_url = args.url.rstrip("/")
+        else:
+            workdir = tempfile.mkdtemp(prefix="loadgen-")
+            processes.append(subprocess.Popen(
+                [sys.executable, "benchmarks/stub_upstreams.py", "--host", args.host, "--base-port", str(args.stub_port)],
+                # Cancelled model calls (e.g. late summaries) show up as disconnect tracebacks there
+                cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            ))
+            processes.append(subprocess.Popen(
+                [sys.executable, "-m", "uvicorn", "backend:app", "--host", args.host, "--port", str(args.port),
+                 "--workers", str(args.workers), "--log-level", "warning"],
+                cwd=ROOT, env=backend_env(args.host, args.stub_port, workdir, args.keep_rate_limits),
+                stdout=subprocess.DEVNULL,
+            ))
+            wait_for_port(args.host, args.stub_port + 7)
+            wait_for_port(args.host, args.port)
+            base_url = f"http://{args.host}:{args.port}"
+
+        print(f"Driving {base_url}/search/ at {args.rate} req/s for {args.duration}s...")
+        samples, elapsed, stats = asyncio.run(
+            drive(base_url, args.rate, args.duration, args.queries, args.poisson, args.timeout)
+        )
+        summary = summarize(samples, elapsed, stats, args.rate)
+        report(summary)
+        if args.json:
+            with open(args.json, "w") as f:
+                json.dump(summary, f, indent=2)
+    finally:
+        for process in reversed(processes):
+            process.terminate()
+            process.wait(timeout=10)
+
+
+if __name__ == "__main__":
+    main()
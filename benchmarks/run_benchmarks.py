@@ -0,0 +1,288 @@
+"""Microbenchmark suite for the CPU-bound hot paths, compared against a stored baseline.
+
+Every case runs over the recorded payloads in fixtures/ at two sizes:
+"realistic" (what one request sees) and "large" (the payload scaled up
+LARGE_SCALE times). Each case reports the best per-call time over several
+repeats; the comparison uses that minimum because it is the least noisy.
+
+Baselines are only comparable on the same machine. Record one before a
+change, then rerun after it:
+    python benchmarks/run_benchmarks.py --save            # write baseline.json
+    python benchmarks/run_benchmarks.py                   # compare with baseline.json
+    python benchmarks/run_benchmarks.py -k prompt --fail-above 15
+"""
+import argparse
+import copy
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+from types import SimpleNamespace
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT)
+sys.path.insert(0, BENCH_DIR)
+
+# Offline by default: keep the SQLite-backed singletons imported below off the working tree
+os.environ.setdefault("RESULT_CACHE_PATH", ":memory:")
+os.environ.setdefault("RATE_LIMIT_PATH", ":memory:")
+
+from bench_arxiv_parse import scaled_feed  # noqa: E402
+from bench_cold_start import IMPORT_SNIPPET, run_snippet  # noqa: E402
+
+FIXTURES = os.path.join(BENCH_DIR, "fixtures")
+BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+LARGE_SCALE = 200
+REPEATS = 5
+MIN_REPEAT_SECONDS = 0.05
+
+
+def fixture(name):
+    with open(os.path.join(FIXTURES, name), "rb") as f:
+        return f.read()
+
+
+def scaled_list(items, scale):
+    """Repeats `items` `scale` times, making titles and urls unique so dedup does not collapse them."""
+    scaled = []
+    for copy_index in range(scale):
+        for item in items:
+            item = dict(item)
+            if copy_index:
+                item["title"] = f"{item.get('title', '')} part {copy_index}"
+                item["url"] = f"{item.get('url', '')}?copy={copy_index}"
+            scaled.append(item)
+    return scaled
+
+
+def scaled_payload(raw, key, scale, path=None):
+    """Decodes a recorded JSON payload and repeats its result list (at data[key], or data[path][key])."""
+    data = json.loads(raw)
+    target = data[path] if path else data
+    target[key] = [copy.deepcopy(item) for _ in range(scale) for item in target[key]]
+    return json.dumps(data).encode()
+
+
+# ✅ Cases: each returns {size: zero-argument callable}
+def arxiv_cases():
+    from arxiv_parser import parse_arxiv_feed
+
+    realistic, large = scaled_feed(5), scaled_feed(5 * LARGE_SCALE)
+    return {
+        "realistic": lambda: parse_arxiv_feed(realistic, 5),
+        "large": lambda: parse_arxiv_feed(large, 5 * LARGE_SCALE),
+    }
+
+
+def normalize_cases():
+    """Decode plus normalization, as each adapter does with a response body."""
+    from tools import _parse_hackernews, _parse_newsapi
+    from youtube import _parse_videos
+    from tavily import _parse_tavily
+    from reddit import _parse_submission
+
+    def reddit(raw):
+        listing = json.loads(raw)
+        return [_parse_submission(SimpleNamespace(**child["data"])) for child in listing["data"]["children"]]
+
+    adapters = {
+        "hackernews": (fixture("hackernews.json"), "hits", None, lambda raw: _parse_hackernews(json.loads(raw))),
+        "newsapi": (fixture("newsapi.json"), "articles", None, lambda raw: _parse_newsapi(json.loads(raw))),
+        "youtube": (fixture("youtube.json"), "items", None, lambda raw: _parse_videos(json.loads(raw))),
+        "tavily": (fixture("tavily.json"), "results", None, lambda raw: _parse_tavily(json.loads(raw)["results"])),
+        "reddit": (fixture("reddit.json"), "children", "data", reddit),
+    }
+    cases = {}
+    for name, (raw, key, path, parse) in adapters.items():
+        large = scaled_payload(raw, key, LARGE_SCALE, path)
+        cases[f"{name}/realistic"] = lambda raw=raw, parse=parse: parse(raw)
+        cases[f"{name}/large"] = lambda large=large, parse=parse: parse(large)
+    return cases
+
+
+def recorded_results(scale=1):
+    """Per-source results as the adapters return them, built from the recorded payloads."""
+    from tools import _parse_hackernews, _parse_newsapi
+    from youtube import _parse_videos
+    from tavily import _parse_tavily
+    from reddit import _parse_submission
+    from arxiv_parser import parse_arxiv_feed
+
+    listing = json.loads(fixture("reddit.json"))
+    results = {
+        "Reddit": [_parse_submission(SimpleNamespace(**c["data"])) for c in listing["data"]["children"]],
+        "Tavily": _parse_tavily(json.loads(fixture("tavily.json"))["results"]),
+        "YouTube": _parse_videos(json.loads(fixture("youtube.json"))),
+        "Wikipedia": fixture("wikipedia.txt").decode() * scale,
+        "Hacker News": _parse_hackernews(json.loads(fixture("hackernews.json"))),
+        "NewsAPI": _parse_newsapi(json.loads(fixture("newsapi.json"))),
+        "Arxiv": parse_arxiv_feed(scaled_feed(5), 5),
+    }
+    return {
+        source: scaled_list(value, scale) if isinstance(value, list) else value
+        for source, value in results.items()
+    }
+
+
+def prompt_cases():
+    """The CPU work run_supervisor_flow does between the fan-out and the model call."""
+    from dedup import dedup_results
+    from supervisor import build_messages, build_report_prompt
+
+    def build(results):
+        deduped = dedup_results(results)
+        messages = build_messages("large language models", deduped)
+        return build_report_prompt("large language models", "\n\n".join(m["content"] for m in messages[1:]))
+
+    realistic, large = recorded_results(), recorded_results(LARGE_SCALE)
+    return {"realistic": lambda: build(realistic), "large": lambda: build(large)}
+
+
+def serialize_cases():
+    """How FastAPI renders backend.search's response body (no response_model)."""
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import JSONResponse
+
+    def render(body):
+        return JSONResponse(jsonable_encoder(body)).body
+
+    realistic = {"final_response": "report " * 300, "raw_results": recorded_results()}
+    large = {"final_response": "report " * 300, "raw_results": recorded_results(LARGE_SCALE)}
+    return {"realistic": lambda: render(realistic), "large": lambda: render(large)}
+
+
+def dataframe_cases():
+    """app.display_results: one DataFrame per source tab, reduced to title and url."""
+    import pandas as pd
+
+    def display(raw_results):
+        for results in raw_results.values():
+            if isinstance(results, list) and results:
+                df = pd.DataFrame(results)
+                if "title" in df.columns and "url" in df.columns:
+                    df[["title", "url"]].to_dict(orient="records")
+
+    realistic, large = recorded_results(), recorded_results(LARGE_SCALE)
+    return {"realistic": lambda: display(realistic), "large": lambda: display(large)}
+
+
+CASES = {
+    "arxiv_parse": arxiv_cases,
+    "normalize": normalize_cases,
+    "prompt": prompt_cases,
+    "serialize": serialize_cases,
+    "dataframe": dataframe_cases,
+}
+
+
+def time_call(func):
+    """Best and median seconds per call, looping enough for each repeat to take MIN_REPEAT_SECONDS."""
+    func()  # warm caches and lazy imports
+    number = 1
+    while True:
+        elapsed = timeit.timeit(func, number=number)
+        if elapsed >= MIN_REPEAT_SECONDS:
+            break
+        number *= 2 if elapsed == 0 else max(2, int(MIN_REPEAT_SECONDS / elapsed * 1.2))
+    samples = [t / number for t in timeit.repeat(func, number=number, repeat=REPEATS)]
+    return {"min": min(samples), "median": statistics.median(samples)}
+
+
+def time_import(module, runs):
+    samples = [run_snippet(IMPORT_SNIPPET.format(module=module))["seconds"] for _ in range(runs)]
+    return {"min": min(samples), "median": statistics.median(samples)}
+
+
+def run(selected, import_runs):
+    results = {}
+    for group, build in CASES.items():
+        try:
+            cases = build()
+        except ImportError as e:
+            print(f"  {group:<34} skipped ({e.name} is not installed)")
+            continue
+        for size, func in cases.items():
+            name = f"{group}/{size}"
+            if selected and not any(pattern in name for pattern in selected):
+                continue
+            results[name] = time_call(func)
+            yield name, results[name]
+    if not selected or any(pattern in "import/supervisor" for pattern in selected):
+        yield "import/supervisor", time_import("supervisor", import_runs)
+
+
+def environment():
+    from context import get_encoding
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "date": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": f"{platform.system()} {platform.machine()} ({os.cpu_count()} CPUs)",
+        # Token counting falls back to an estimate without the tiktoken encoding, which changes the prompt numbers
+        "tiktoken_encoding": get_encoding() is not None,
+    }
+
+
+def fmt(seconds):
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:9.1f} µs"
+    return f"{seconds * 1e3:9.2f} ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-k", action="append", dest="selected", help="only cases whose name contains this (repeatable)")
+    parser.add_argument("--save", action="store_true", help=f"write the results to {os.path.relpath(BASELINE, ROOT)}")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--fail-above", type=float, help="exit 1 if any case is this many percent slower than baseline")
+    parser.add_argument("--import-runs", type=int, default=5)
+    args = parser.parse_args()
+
+    baseline = {}
+    if os.path.exists(args.baseline) and not args.save:
+        with open(args.baseline) as f:
+            stored = json.load(f)
+        baseline = stored["results"]
+        print(f"Comparing with baseline from {stored['meta'].get('commit')} ({stored['meta'].get('date')})")
+
+    started = time.perf_counter()
+    results, regressions = {}, []
+    print(f"  {'case':<34}{'best':>12}{'median':>12}{'baseline':>12}{'change':>9}")
+    for name, result in run(args.selected, args.import_runs):
+        results[name] = result
+        line = f"  {name:<34}{fmt(result['min'])}{fmt(result['median'])}"
+        if name in baseline:
+            change = (result["min"] / baseline[name]["min"] - 1) * 100
+            line += f"{fmt(baseline[name]['min'])}{change:+8.1f}%"
+            if args.fail_above is not None and change > args.fail_above:
+                regressions.append(name)
+                line += "  ⚠️"
+        print(line)
+    print(f"Done in {time.perf_counter() - started:.1f}s")
+
+    if args.save:
+        with open(args.baseline, "w") as f:
+            json.dump({"meta": environment(), "results": results}, f, indent=2)
+            f.write("\n")
+        print(f"Saved baseline to {os.path.relpath(args.baseline, ROOT)}")
+
+    if regressions:
+        print(f"Slower than baseline by more than {args.fail_above}%: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
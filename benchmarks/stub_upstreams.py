@@ -0,0 +1,289 @@
+"""Offline stand-ins for every upstream the backend calls, with configurable latency and errors.
+
+Serves Hacker News, NewsAPI, arXiv, YouTube, Reddit, Tavily, Wikipedia and
+the OpenAI chat completions API, each on its own port (so the backend's
+per-host connection caps behave as they do against the real hosts).
+Responses have the same shape as the real APIs and are generated from the
+query, so nothing needs recording.
+
+Each upstream's latency is lognormal around a median. Configure with
+    STUB_LATENCY_<NAME>=<median seconds>[,<sigma>]   e.g. STUB_LATENCY_YOUTUBE=0.4,0.6
+    STUB_ERROR_RATE_<NAME>=<0..1>                    (or STUB_ERROR_RATE for all)
+and for the chat model additionally STUB_OPENAI_PREFILL_TPS (prompt tokens
+per second) and STUB_OPENAI_TOKEN_DELAY (seconds per generated token).
+
+Run from the repo root:
+    python benchmarks/stub_upstreams.py [--host 127.0.0.1] [--base-port 9100]
+and start the backend with the environment it prints.
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import time
+import zlib
+from html import escape
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+
+# ✅ Default (median seconds, sigma) per upstream, roughly what the real APIs do on a good day
+DEFAULT_LATENCY = {
+    "hackernews": (0.15, 0.4),
+    "newsapi": (0.25, 0.5),
+    "arxiv": (0.6, 0.5),
+    "youtube": (0.3, 0.4),
+    "reddit": (0.4, 0.6),
+    "tavily": (1.2, 0.4),
+    "wikipedia": (0.2, 0.4),
+    "openai": (0.4, 0.3),
+}
+UPSTREAMS = list(DEFAULT_LATENCY)
+REPORT_TOKENS = 300
+
+
+def latency_profile(name):
+    value = os.getenv(f"STUB_LATENCY_{name.upper()}")
+    if not value:
+        return DEFAULT_LATENCY[name]
+    median, _, sigma = value.partition(",")
+    return float(median), float(sigma or DEFAULT_LATENCY[name][1])
+
+
+def error_rate(name):
+    return float(os.getenv(f"STUB_ERROR_RATE_{name.upper()}", os.getenv("STUB_ERROR_RATE", "0")))
+
+
+def upstream_env(host="127.0.0.1", base_port=9100):
+    """Environment that points the backend at the stubs, with dummy credentials."""
+    url = {name: f"http://{host}:{base_port + i}" for i, name in enumerate(UPSTREAMS)}
+    return {
+        "HACKERNEWS_URL": f"{url['hackernews']}/api/v1/search",
+        "NEWSAPI_URL": f"{url['newsapi']}/v2/everything",
+        "ARXIV_URL": f"{url['arxiv']}/api/query",
+        "YOUTUBE_SEARCH_URL": f"{url['youtube']}/youtube/v3/search",
+        "REDDIT_URL": url["reddit"],
+        "REDDIT_OAUTH_URL": url["reddit"],
+        "TAVILY_API_URL": url["tavily"],
+        "WIKIPEDIA_API_URL": f"{url['wikipedia']}/w/api.php",
+        "OPENAI_BASE_URL": f"{url['openai']}/v1",
+        "NEWS_API_KEY": "stub",
+        "YOUTUBE_API_KEY": "stub",
+        "TAVILY_API_KEY": "stub",
+        "OPENAI_API_KEY": "stub",
+        "REDDIT_CLIENT_ID": "stub",
+        "REDDIT_CLIENT_SECRET": "stub",
+        "REDDIT_USER_AGENT": "stub-load-test",
+    }
+
+
+async def upstream_delay(name):
+    """Sleeps one sampled latency for `name`. Returns an error response instead of None when one is drawn."""
+    median, sigma = latency_profile(name)
+    await asyncio.sleep(random.lognormvariate(math.log(median), sigma))
+    if random.random() < error_rate(name):
+        return JSONResponse({"error": f"stub {name} failure"}, status_code=503)
+    return None
+
+
+WORDS = (
+    "adaptive benchmark compiler dataset edge federated graph hybrid inference kernel latency memory neural "
+    "open pipeline quantized robust sparse tensor unified vector workload agent cache scaling retrieval "
+    "planning safety audit market policy startup funding release launch review survey tutorial analysis"
+).split()
+
+
+def items(query, count, prefix):
+    """Deterministic fake results for `query`, so repeated queries see the same data.
+
+    Titles draw on a random vocabulary per upstream and item, so different
+    upstreams do not look like near-duplicates of each other.
+    """
+    seed = zlib.crc32(f"{prefix}|{query}".encode())
+    rng = random.Random(seed)
+    return [
+        {"id": f"{seed:x}{i}", "title": f"{query}: {' '.join(rng.sample(WORDS, 4))}", "slug": f"{seed:x}{i:02d}"}
+        for i in range(count)
+    ]
+
+
+def build_app(name):
+    """One stub app; every upstream gets its own instance and port."""
+    app = FastAPI()
+
+    @app.get("/api/v1/search")
+    async def hackernews(query: str = "", hitsPerPage: int = 5):
+        if (error := await upstream_delay("hackernews")) is not None:
+            return error
+        return {"hits": [
+            {"objectID": it["id"], "title": it["title"], "url": f"https://news.example.com/{it['slug']}", "points": 42}
+            for it in items(query, hitsPerPage, "Story")
+        ]}
+
+    @app.get("/v2/everything")
+    async def newsapi(q: str = "", pageSize: int = 5):
+        if (error := await upstream_delay("newsapi")) is not None:
+            return error
+        return {"status": "ok", "totalResults": pageSize, "articles": [
+            {"title": it["title"], "url": f"https://press.example.com/{it['slug']}", "description": f"Coverage of {q}."}
+            for it in items(q, pageSize, "Article")
+        ]}
+
+    @app.get("/api/query")
+    async def arxiv(search_query: str = "", max_results: int = 5):
+        if (error := await upstream_delay("arxiv")) is not None:
+            return error
+        query = search_query.removeprefix("all:")
+        entries = "".join(
+            f"""<entry><id>http://arxiv.org/abs/2501.{i:05d}v1</id><published>2025-01-0{i % 9 + 1}T00:00:00Z</published>
+<title>{escape(it['title'])}</title><summary>We study {escape(query)}. {'Results are reported. ' * 20}</summary>
+<author><name>Author {i}</name></author>
+<link href="http://arxiv.org/abs/2501.{i:05d}v1" rel="alternate" type="text/html"/>
+<link title="pdf" href="http://arxiv.org/pdf/2501.{i:05d}v1" rel="related" type="application/pdf"/></entry>"""
+            for i, it in enumerate(items(query, max_results, "Paper"))
+        )
+        feed = f'<?xml version="1.0" encoding="UTF-8"?><feed xmlns="http://www.w3.org/2005/Atom">{entries}</feed>'
+        return Response(feed, media_type="application/atom+xml")
+
+    @app.get("/youtube/v3/search")
+    async def youtube(q: str = "", maxResults: int = 5):
+        if (error := await upstream_delay("youtube")) is not None:
+            return error
+        return {"items": [
+            {
+                "id": {"kind": "youtube#video", "videoId": it["slug"]},
+                "snippet": {
+                    "title": it["title"],
+                    "channelTitle": "Stub Channel",
+                    "publishedAt": "2025-01-01T00:00:00Z",
+                    "thumbnails": {"high": {"url": f"https://img.example.com/{it['slug']}.jpg"}},
+                },
+            }
+            for it in items(q, maxResults, "Video")
+        ]}
+
+    @app.post("/api/v1/access_token")
+    async def reddit_token():
+        return {"access_token": "stub-token", "token_type": "bearer", "expires_in": 86400, "scope": "*"}
+
+    @app.get("/r/{subreddit}/search")
+    @app.get("/r/{subreddit}/search/")
+    async def reddit(subreddit: str, q: str = "", limit: int = 5):
+        if (error := await upstream_delay("reddit")) is not None:
+            return error
+        children = [
+            {"kind": "t3", "data": {
+                "id": it["slug"], "name": f"t3_{it['slug']}", "title": it["title"], "score": 100 + i,
+                "permalink": f"/r/{subreddit}/comments/{it['slug']}/stub/", "subreddit": subreddit,
+            }}
+            for i, it in enumerate(items(q, limit, "Post"))
+        ]
+        return {"kind": "Listing", "data": {"children": children, "after": None, "before": None}}
+
+    @app.post("/search")
+    async def tavily(request: Request):
+        body = await request.json()
+        if (error := await upstream_delay("tavily")) is not None:
+            return error
+        return {"results": [
+            {"title": it["title"], "url": f"https://web.example.com/{it['slug']}", "content": "Snippet.", "score": 0.9}
+            for it in items(body.get("query", ""), body.get("max_results", 3), "Page")
+        ]}
+
+    @app.get("/w/api.php")
+    async def wikipedia(request: Request):
+        params = request.query_params
+        if (error := await upstream_delay("wikipedia")) is not None:
+            return error
+        # The async adapter: titles with revision IDs from one generator call, then extracts by page ID
+        if params.get("generator") == "search":
+            found = items(params.get("gsrsearch", ""), int(params.get("gsrlimit", 3)), "Topic")
+            pages = [
+                {"pageid": zlib.crc32(it["title"].encode()), "ns": 0, "title": it["title"], "index": i + 1,
+                 "lastrevid": zlib.crc32(f"{it['title']}|rev".encode())}
+                for i, it in enumerate(found)
+            ]
+            return {"batchcomplete": True, "query": {"pages": pages}}
+        if params.get("pageids"):
+            page_id = int(params["pageids"])
+            repeat = 8 if params.get("exintro") else 80
+            return {"batchcomplete": True, "query": {"pages": [
+                {"pageid": page_id, "ns": 0, "extract": f"Article {page_id} is a stub article. " * repeat}
+            ]}}
+        # The wikipedia package behind the LangChain tool
+        if params.get("list") == "search":
+            query = params.get("srsearch", "")
+            results = [{"title": it["title"]} for it in items(query, int(params.get("srlimit", 3)), "Topic")]
+            return {"query": {"search": results, "searchinfo": {}}}
+        title = params.get("titles", "")
+        page_id = str(zlib.crc32(title.encode()))
+        page = {"pageid": int(page_id), "title": title, "fullurl": f"https://en.wikipedia.org/wiki/{page_id}"}
+        if params.get("prop") == "extracts":
+            page["extract"] = f"{title} is a stub article. " * 40
+        return {"query": {"pages": {page_id: page}}}
+
+    @app.post("/v1/chat/completions")
+    async def openai(request: Request):
+        body = await request.json()
+        prompt_tokens = sum(len(str(m.get("content", ""))) for m in body.get("messages", [])) // 4
+        completion_tokens = min(body.get("max_tokens") or body.get("max_completion_tokens") or REPORT_TOKENS, REPORT_TOKENS)
+        if (error := await upstream_delay("openai")) is not None:
+            return JSONResponse({"error": {"message": "stub overloaded", "type": "server_error"}}, status_code=503)
+        # Prefill scales with the prompt, which is what context packing and map-reduce try to shrink
+        await asyncio.sleep(prompt_tokens / float(os.getenv("STUB_OPENAI_PREFILL_TPS", "20000")))
+        token_delay = float(os.getenv("STUB_OPENAI_TOKEN_DELAY", "0.004"))
+        usage = {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                 "total_tokens": prompt_tokens + completion_tokens}
+        base = {"id": "chatcmpl-stub", "created": int(time.time()), "model": body.get("model", "stub")}
+
+        if not body.get("stream"):
+            await asyncio.sleep(completion_tokens * token_delay)
+            return {**base, "object": "chat.completion", "usage": usage, "choices": [{
+                "index": 0, "finish_reason": "stop",
+                "message": {"role": "assistant", "content": "word " * completion_tokens},
+            }]}
+
+        async def chunks():
+            for _ in range(completion_tokens):
+                await asyncio.sleep(token_delay)
+                delta = {"index": 0, "delta": {"content": "word "}, "finish_reason": None}
+                yield f"data: {json.dumps({**base, 'object': 'chat.completion.chunk', 'choices': [delta]})}\n\n"
+            done = {"index": 0, "delta": {}, "finish_reason": "stop"}
+            yield f"data: {json.dumps({**base, 'object': 'chat.completion.chunk', 'choices': [done]})}\n\n"
+            if (body.get("stream_options") or {}).get("include_usage"):
+                yield f"data: {json.dumps({**base, 'object': 'chat.completion.chunk', 'choices': [], 'usage': usage})}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(chunks(), media_type="text/event-stream")
+
+    app.title = f"stub-{name}"
+    return app
+
+
+async def serve(host="127.0.0.1", base_port=9100):
+    """Runs every stub on its own port until cancelled."""
+    import uvicorn
+
+    servers = [
+        uvicorn.Server(uvicorn.Config(build_app(name), host=host, port=base_port + i, log_level="warning"))
+        for i, name in enumerate(UPSTREAMS)
+    ]
+    await asyncio.gather(*(server.serve() for server in servers))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--base-port", type=int, default=9100)
+    args = parser.parse_args()
+
+    print("Point the backend at the stubs with:")
+    for key, value in upstream_env(args.host, args.base_port).items():
+        print(f"  export {key}={value}")
+    asyncio.run(serve(args.host, args.base_port))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dotenv import load_dotenv
+
+# ✅ Load environment variables
+load_dotenv()
+
+RESULT_CACHE_PATH = os.getenv("RESULT_CACHE_PATH", "result_cache.sqlite3")
+RESULT_CACHE_MAX_ENTRIES = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "2048"))
+RESULT_CACHE_SWEEP_EVERY = int(os.getenv("RESULT_CACHE_SWEEP_EVERY", "200"))
+# How long expired rows are kept on disk as a fallback when a source is out of budget
+RESULT_CACHE_STALE_TTL = float(os.getenv("RESULT_CACHE_STALE_TTL", "86400"))
+
+# ✅ Seconds each source's results stay fresh (override with e.g. CACHE_TTL_HACKER_NEWS=120)
+DEFAULT_TTLS = {
+    "Reddit": 300,
+    "NewsAPI": 600,
+    "Hacker News": 600,
+    "Tavily": 900,
+    "YouTube": 1800,
+    "Arxiv": 43200,
+    "Wikipedia": 86400,
+}
+DEFAULT_TTL = 600
+
+
+def normalize_query(query: str) -> str:
+    """Lowercases and collapses whitespace so trivially different queries share a key."""
+    return " ".join(query.lower().split())
+
+
+def source_ttl(source: str) -> float:
+    env_name = "CACHE_TTL_" + source.upper().replace(" ", "_")
+    return float(os.getenv(env_name, DEFAULT_TTLS.get(source, DEFAULT_TTL)))
+
+
+class ResultCache:
+    """Two-tier cache of per-source results: an in-process LRU in front of a shared SQLite file.
+
+    The SQLite tier runs in WAL mode so several uvicorn workers can read and
+    write the same file, and it survives restarts. Empty results are never
+    stored because the adapters return [] on failure.
+    """
+
+    def __init__(self, path=RESULT_CACHE_PATH, max_entries=RESULT_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self._memory = OrderedDict()
+        self._db = None
+        self._db_lock = threading.Lock()
+        self._writes = 0
+        self.counters = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "stale_hits": 0,
+            "memory_evictions": 0,
+            "disk_evictions": 0,
+        }
+
+    @staticmethod
+    def make_key(source, query, num_results):
+        return f"{source}|{normalize_query(query)}|{num_results}"
+
+    # ✅ SQLite tier (blocking; always called through asyncio.to_thread)
+    def _connect(self):
+        if self._db is None:
+            db = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, source TEXT, value TEXT, expires_at REAL)"
+            )
+            self._db = db
+        return self._db
+
+    def _disk_get(self, key, allow_stale=False):
+        with self._db_lock:
+            row = self._connect().execute(
+                "SELECT value, expires_at FROM results WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or (row[1] <= time.time() and not allow_stale):
+            return None
+        return json.loads(row[0]), row[1]
+
+    def _disk_set(self, key, source, value, expires_at):
+        with self._db_lock:
+            db = self._connect()
+            with db:
+                db.execute(
+                    "INSERT OR REPLACE INTO results (key, source, value, expires_at) VALUES (?, ?, ?, ?)",
+                    (key, source, json.dumps(value), expires_at),
+                )
+            self._writes += 1
+            if self._writes % RESULT_CACHE_SWEEP_EVERY == 0:
+                with db:
+                    swept = db.execute(
+                        "DELETE FROM results WHERE expires_at <= ?", (time.time() - RESULT_CACHE_STALE_TTL,)
+                    ).rowcount
+                self.counters["disk_evictions"] += swept
+
+    # ✅ In-memory LRU tier
+    def _memory_get(self, key, min_ttl=0):
+        entry = self._memory.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.time():
+            del self._memory[key]
+            self.counters["memory_evictions"] += 1
+            return None
+        if entry[0] <= time.time() + min_ttl:
+            return None
+        self._memory.move_to_end(key)
+        return entry
+
+    def _memory_set(self, key, value, expires_at):
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.counters["memory_evictions"] += 1
+
+    async def get(self, source, query, num_results, min_ttl=0):
+        """Returns cached results, or None on a miss. Results expiring within `min_ttl` seconds count as a miss."""
+        key = self.make_key(source, query, num_results)
+
+        entry = self._memory_get(key, min_ttl)
+        if entry is not None:
+            self.counters["memory_hits"] += 1
+            return entry[1]
+
+        found = await asyncio.to_thread(self._disk_get, key)
+        if found is not None and found[1] > time.time() + min_ttl:
+            value, expires_at = found
+            self._memory_set(key, value, expires_at)
+            self.counters["disk_hits"] += 1
+            return value
+
+        self.counters["misses"] += 1
+        return None
+
+    def expires_at(self, source, query, num_results):
+        """When the results held in memory for this call expire, or None if they are not in memory."""
+        entry = self._memory.get(self.make_key(source, query, num_results))
+        return entry[0] if entry is not None else None
+
+    async def get_stale(self, source, query, num_results):
+        """Returns the last stored results even if expired, or None. Used when upstream is out of budget."""
+        key = self.make_key(source, query, num_results)
+        entry = self._memory.get(key)
+        if entry is None:
+            entry = await asyncio.to_thread(self._disk_get, key, True)
+            if entry is None:
+                return None
+            entry = (entry[1], entry[0])
+        self.counters["stale_hits"] += 1
+        return entry[1]
+
+    async def set(self, source, query, num_results, value):
+        if not value:
+            return
+        key = self.make_key(source, query, num_results)
+        expires_at = time.time() + source_ttl(source)
+        self._memory_set(key, value, expires_at)
+        await asyncio.to_thread(self._disk_set, key, source, value, expires_at)
+
+    def stats(self):
+        lookups = self.counters["memory_hits"] + self.counters["disk_hits"] + self.counters["misses"]
+        hits = lookups - self.counters["misses"]
+        return {
+            **self.counters,
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+            "memory_entries": len(self._memory),
+        }
+
+    def close(self):
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+            self._db = None
+
+
+# ✅ Process-wide cache shared by every request
+result_cache = ResultCache()
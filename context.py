@@ -0,0 +1,153 @@
+import os
+import threading
+import time
+from dotenv import load_dotenv
+
+# ✅ Load environment variables
+load_dotenv()
+
+# ✅ Token budget for the results packed into the report prompt, counted for the synthesis model
+CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", "6000"))
+CONTEXT_MODEL = os.getenv("CONTEXT_MODEL", "gpt-4o-mini")
+# Longest text field (abstract, snippet, description) kept per item, however much budget is left
+MAX_ITEM_TEXT_TOKENS = int(os.getenv("MAX_ITEM_TEXT_TOKENS", "120"))
+# Seconds to keep estimating after the encoding fails to load before trying again
+ENCODING_RETRY_BACKOFF = float(os.getenv("ENCODING_RETRY_BACKOFF", "60"))
+
+# ✅ Item fields by how much they tell the model, most informative first
+TITLE_FIELDS = ("title",)
+TEXT_FIELDS = ("abstract", "content", "description", "summary", "text")
+META_FIELDS = ("sources", "score", "channel", "authors", "published", "published_at")
+# Never worth tokens: thumbnails, duplicate links
+SKIPPED_FIELDS = {"thumbnail", "pdf_url", "urls"}
+
+_encoding = None
+_encoding_retry_at = 0
+_encoding_lock = threading.Lock()
+
+
+def get_encoding():
+    """Loads the tiktoken encoding for CONTEXT_MODEL once. Returns None while it cannot be loaded."""
+    global _encoding, _encoding_retry_at
+    if _encoding is None and time.monotonic() >= _encoding_retry_at:
+        with _encoding_lock:
+            if _encoding is None and time.monotonic() >= _encoding_retry_at:
+                try:
+                    import tiktoken
+                    try:
+                        _encoding = tiktoken.encoding_for_model(CONTEXT_MODEL)
+                    except KeyError:
+                        _encoding = tiktoken.get_encoding("o200k_base")
+                except Exception as e:
+                    # tiktoken downloads its BPE file on first use; estimate, and try again after the backoff
+                    print(f"⚠️ Token encoding unavailable, estimating 4 characters per token: {e}")
+                    _encoding_retry_at = time.monotonic() + ENCODING_RETRY_BACKOFF
+    return _encoding
+
+
+def count_tokens(text):
+    encoding = get_encoding()
+    if encoding is None:
+        return (len(text) + 3) // 4
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def truncate_tokens(text, limit):
+    """Cuts `text` to at most `limit` tokens, marking the cut with an ellipsis."""
+    if limit <= 0:
+        return ""
+    encoding = get_encoding()
+    if encoding is None:
+        return text if len(text) <= limit * 4 else text[:max(limit * 4 - 1, 0)] + "…"
+    tokens = encoding.encode(text, disallowed_special=())
+    if len(tokens) <= limit:
+        return text
+    return encoding.decode(tokens[:max(limit - 1, 0)]) + "…"
+
+
+def _format_value(value):
+    if isinstance(value, (list, tuple)):
+        return ", ".join(str(v) for v in value)
+    return str(value)
+
+
+def _item_parts(item):
+    """Splits one result into a headline (title, url, metadata) and its longest free-text field."""
+    if not isinstance(item, dict):
+        return f"- {item}", ""
+    title = next((item[f] for f in TITLE_FIELDS if item.get(f)), None)
+    head = f"- {title}" if title else "-"
+    if item.get("url") and item["url"] != "#":
+        head += f" <{item['url']}>"
+    meta = [f"{field}: {_format_value(item[field])}" for field in META_FIELDS if item.get(field)]
+    known = set(TITLE_FIELDS) | set(TEXT_FIELDS) | set(META_FIELDS) | SKIPPED_FIELDS | {"url"}
+    meta += [f"{k}: {_format_value(v)}" for k, v in item.items() if k not in known and v not in (None, "", [])]
+    if meta:
+        head += f" ({'; '.join(meta)})"
+    text = next((str(item[f]) for f in TEXT_FIELDS if item.get(f)), "")
+    return head, " ".join(text.split())
+
+
+def _pack_source(results, quota):
+    """Renders one source's results in at most `quota` tokens.
+
+    Headlines go in first, in rank order, until the quota runs out; whatever
+    is left is shared evenly between the kept items' text fields.
+    """
+    if isinstance(results, dict) and "status" in results:
+        return truncate_tokens(f"(no results: {results['status']})", quota)
+    if not isinstance(results, list):
+        return truncate_tokens(str(results).strip(), quota)
+    if not results:
+        return "(no results)"
+
+    parts = [_item_parts(item) for item in results]
+    kept, used = [], 0
+    for head, text in parts:
+        cost = count_tokens(head) + 1
+        if used + cost > quota:
+            break
+        kept.append((head, text))
+        used += cost
+
+    texts = [text for _, text in kept if text]
+    share = min((quota - used) // len(texts), MAX_ITEM_TEXT_TOKENS) if texts else 0
+    lines = []
+    for head, text in kept:
+        lines.append(head)
+        if text and share > 2:
+            lines.append(f"  {truncate_tokens(text, share - 1)}")
+    if len(kept) < len(parts):
+        lines.append(f"- …{len(parts) - len(kept)} more not shown")
+    return "\n".join(lines)
+
+
+def _full_cost(results):
+    if isinstance(results, list):
+        return sum(
+            count_tokens(head) + min(count_tokens(text), MAX_ITEM_TEXT_TOKENS) + 2
+            for head, text in map(_item_parts, results)
+        )
+    return count_tokens(str(results))
+
+
+def pack_results(results, budget=None):
+    """Packs results keyed by source name into at most `budget` tokens (CONTEXT_TOKEN_BUDGET by default).
+
+    Each source gets a max-min fair share of the budget: sources that need
+    less than an even split keep what they need, and the rest is divided
+    between the larger ones. Returns the packed text keyed by source name.
+    """
+    budget = budget or CONTEXT_TOKEN_BUDGET
+    needs = {source: _full_cost(source_results) for source, source_results in results.items()}
+    quotas, remaining = {}, budget
+    for count, source in enumerate(sorted(needs, key=needs.get)):
+        share = remaining // (len(needs) - count)
+        quotas[source] = min(needs[source], share)
+        remaining -= quotas[source]
+    return {source: _pack_source(source_results, quotas[source]) for source, source_results in results.items()}
+
+
+def render_context(packed):
+    """Joins packed sources into the prompt's findings section."""
+    return "\n\n".join(f"### {source}\n{text}" for source, text in packed.items())
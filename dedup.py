@@ -0,0 +1,197 @@
+import re
+import zlib
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import numpy as np
+
+# ✅ Query parameters that only track the click, never change the page
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "igshid", "mc_cid", "mc_eid", "ref", "ref_src", "ref_url",
+    "cmpid", "ocid", "spm", "share", "si", "feature", "context", "_ga", "_gl", "yclid", "s", "smid",
+}
+TRACKING_PREFIXES = ("utm_", "pk_", "hsa_", "vero_", "oly_")
+
+# ✅ MinHash / LSH settings: 64 hashes in 16 bands of 4 rows make title pairs around Jaccard >= 0.5 candidates,
+# then candidates must share SIMILARITY_THRESHOLD of their word bigrams exactly. Character shingles gave
+# "Apple stock rises ..." and "Apple stock falls ..." 0.6, since every result for a query shares its words.
+NUM_HASHES = 64
+BANDS = 16
+ROWS = NUM_HASHES // BANDS
+SIMILARITY_THRESHOLD = 0.7
+
+_rng = np.random.default_rng(0x5EED)
+_HASH_A = _rng.integers(1, 2**63, NUM_HASHES, dtype=np.uint64) | np.uint64(1)
+_HASH_B = _rng.integers(0, 2**63, NUM_HASHES, dtype=np.uint64)
+
+# Titles too generic to cluster on (tools.py uses the first when Hacker News has no title)
+PLACEHOLDER_TITLES = {"", "no title available"}
+
+_REDDIT_POST = re.compile(r"^/(?:r/[^/]+/)?comments/([a-z0-9]+)")
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+
+def canonicalize_url(url):
+    """Normalizes a URL so copies of the same page compare equal.
+
+    Drops tracking parameters, fragments, `www.`/mobile hosts and trailing
+    slashes, and maps Reddit, YouTube and arXiv variants to one form.
+    """
+    if not url or url == "#":
+        return ""
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    for prefix in ("www.", "m.", "old.", "np.", "new.", "mobile."):
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+    path = parts.path.rstrip("/") or "/"
+    params = [
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    ]
+
+    if host == "redd.it":
+        return f"https://reddit.com/comments/{path.strip('/').lower()}"
+    if host == "reddit.com":
+        post = _REDDIT_POST.match(path.lower())
+        if post:
+            return f"https://reddit.com/comments/{post.group(1)}"
+
+    if host == "youtu.be":
+        return f"https://youtube.com/watch?v={path.strip('/')}"
+    if host in ("youtube.com", "youtube-nocookie.com"):
+        video = dict(params).get("v")
+        for prefix in ("/shorts/", "/embed/", "/live/"):
+            if path.startswith(prefix):
+                video = path[len(prefix):].split("/")[0]
+        if video:
+            return f"https://youtube.com/watch?v={video}"
+
+    if host in ("arxiv.org", "export.arxiv.org"):
+        paper = re.match(r"^/(?:abs|pdf)/(.+?)(?:v\d+)?(?:\.pdf)?$", path)
+        if paper:
+            return f"https://arxiv.org/abs/{paper.group(1)}"
+
+    return urlunsplit(("https", host, path, urlencode(sorted(params)), ""))
+
+
+def title_shingles(title):
+    """Hashed word bigrams of a title (its only word, for one-word titles)."""
+    words = _NON_WORD.sub(" ", title.lower()).split()
+    grams = [" ".join(pair) for pair in zip(words, words[1:])] or words
+    return {zlib.crc32(gram.encode()) for gram in grams}
+
+
+def title_numbers(title):
+    """Numbers in a title (versions, years, parts). Duplicates may add a number, e.g. a year, but not change one."""
+    return frozenset(word for word in _NON_WORD.sub(" ", title.lower()).split() if word.isdigit())
+
+
+def minhash_signatures(shingle_sets):
+    """Returns an (n, NUM_HASHES) MinHash signature matrix, computed for all shingle sets in one vectorized pass."""
+    shingles = [list(s) or [0] for s in shingle_sets]
+    lengths = np.fromiter((len(s) for s in shingles), dtype=np.int64, count=len(shingles))
+    flat = np.fromiter((h for s in shingles for h in s), dtype=np.uint64, count=int(lengths.sum()))
+    # Multiply-shift hashing; uint64 overflow wraps, which is what the scheme relies on
+    with np.errstate(over="ignore"):
+        hashed = (_HASH_A[:, None] * flat[None, :] + _HASH_B[:, None]) >> np.uint64(32)
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    return np.minimum.reduceat(hashed, starts, axis=1).T
+
+
+def _same_story(a, b):
+    """Exact check of an LSH candidate pair of (shingles, numbers) titles."""
+    (shingles_a, numbers_a), (shingles_b, numbers_b) = a, b
+    if not (numbers_a <= numbers_b or numbers_b <= numbers_a):
+        return False
+    return len(shingles_a & shingles_b) >= SIMILARITY_THRESHOLD * len(shingles_a | shingles_b)
+
+
+class _UnionFind:
+    def __init__(self, size):
+        self.parent = list(range(size))
+
+    def find(self, i):
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, i, j):
+        i, j = self.find(i), self.find(j)
+        if i != j:
+            self.parent[max(i, j)] = min(i, j)
+
+
+def cluster_items(items):
+    """Groups item indices whose canonical URLs match or whose titles are near-duplicates."""
+    groups = _UnionFind(len(items))
+
+    by_url = {}
+    for i, item in enumerate(items):
+        url = canonicalize_url(item.get("url", ""))
+        if url:
+            groups.union(i, by_url.setdefault(url, i))
+
+    titled = [i for i, item in enumerate(items) if str(item.get("title") or "").strip().lower() not in PLACEHOLDER_TITLES]
+    if len(titled) > 1:
+        titles = [str(items[i]["title"]) for i in titled]
+        features = [(title_shingles(title), title_numbers(title)) for title in titles]
+        signatures = minhash_signatures([shingles for shingles, _ in features])
+        for band in range(BANDS):
+            buckets = {}
+            rows = signatures[:, band * ROWS:(band + 1) * ROWS]
+            for row, key in enumerate(map(bytes, rows)):
+                buckets.setdefault(key, []).append(row)
+            for members in buckets.values():
+                first = members[0]
+                for other in members[1:]:
+                    i, j = titled[first], titled[other]
+                    if groups.find(i) != groups.find(j) and _same_story(features[first], features[other]):
+                        groups.union(i, j)
+
+    clusters = {}
+    for i in range(len(items)):
+        clusters.setdefault(groups.find(i), []).append(i)
+    return list(clusters.values())
+
+
+def dedup_results(results):
+    """Merges duplicate items across sources before synthesis.
+
+    Takes results keyed by source name. Each cluster of duplicates keeps its
+    first member (in source order) and records provenance on it as
+    `sources` and `urls`; the other copies are dropped. Non-list results,
+    such as failure markers or Wikipedia text, pass through untouched.
+    """
+    entries = [
+        (source, item)
+        for source, source_results in results.items() if isinstance(source_results, list)
+        for item in source_results if isinstance(item, dict)
+    ]
+    if not entries:
+        return results
+
+    keep = {}
+    for members in cluster_items([item for _, item in entries]):
+        first_source, first = entries[members[0]]
+        if len(members) == 1:
+            keep[id(first)] = first
+            continue
+        merged = dict(first)
+        merged["sources"] = list(dict.fromkeys(entries[i][0] for i in members))
+        merged["urls"] = list(dict.fromkeys(entries[i][1].get("url") for i in members if entries[i][1].get("url")))
+        for i in members[1:]:
+            for key, value in entries[i][1].items():
+                merged.setdefault(key, value)
+        keep[id(first)] = merged
+
+    deduped = {}
+    for source, source_results in results.items():
+        if not isinstance(source_results, list):
+            deduped[source] = source_results
+            continue
+        deduped[source] = [
+            keep[id(item)] if isinstance(item, dict) else item
+            for item in source_results if not isinstance(item, dict) or id(item) in keep
+        ]
+    return deduped
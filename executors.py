@@ -0,0 +1,124 @@
+import asyncio
+import contextvars
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from dotenv import load_dotenv
+
+from telemetry import EXECUTOR_SHED, EXECUTOR_WAIT, watch_executor
+
+# ✅ Load environment variables
+load_dotenv()
+
+# ✅ Threads and queued calls per blocking source (override one source with e.g. SOURCE_THREADS_WIKIPEDIA=8)
+SOURCE_THREADS = int(os.getenv("SOURCE_THREADS", "4"))
+SOURCE_QUEUE = int(os.getenv("SOURCE_QUEUE", "8"))
+
+
+def _source_setting(prefix, source, default):
+    return int(os.getenv(prefix + "_" + source.upper().replace(" ", "_"), default))
+
+
+class ExecutorSaturated(Exception):
+    """Raised instead of queueing a call on a source pool whose queue is already full."""
+
+
+class SourceExecutor:
+    """Bounded thread pool for one blocking source.
+
+    At most `threads` calls run at once and `queue_limit` more wait; any
+    call beyond that is shed with ExecutorSaturated rather than queued, so
+    a slow upstream can only tie up its own threads. A call stays counted
+    until its thread finishes, even if the caller gave up on it first.
+    """
+
+    def __init__(self, name, threads=SOURCE_THREADS, queue_limit=SOURCE_QUEUE):
+        self.name = name
+        self.threads = threads
+        self.queue_limit = queue_limit
+        self._pool = ThreadPoolExecutor(threads, thread_name_prefix="source-" + name.lower().replace(" ", "-"))
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.running = 0
+        self.waits = deque(maxlen=200)
+        self.counters = {"submitted": 0, "completed": 0, "dropped": 0, "shed": 0}
+        watch_executor(name, self._pool)
+
+    def _admit(self):
+        with self._lock:
+            if self.pending >= self.threads + self.queue_limit:
+                return False
+            self.pending += 1
+            return True
+
+    def _release(self, future):
+        with self._lock:
+            self.pending -= 1
+            self.counters["dropped" if future.cancelled() else "completed"] += 1
+
+    async def run(self, func, *args):
+        """Runs `func(*args)` on this source's threads, like asyncio.to_thread. Raises ExecutorSaturated when full."""
+        if not self._admit():
+            self.counters["shed"] += 1
+            EXECUTOR_SHED.labels(self.name).inc()
+            raise ExecutorSaturated(f"{self.name} pool is full ({self.threads} running, {self.queue_limit} queued)")
+        self.counters["submitted"] += 1
+        submitted = time.perf_counter()
+
+        def work():
+            wait = time.perf_counter() - submitted
+            self.waits.append(wait)
+            EXECUTOR_WAIT.labels(self.name).observe(wait)
+            with self._lock:
+                self.running += 1
+            try:
+                return func(*args)
+            finally:
+                with self._lock:
+                    self.running -= 1
+
+        # Like asyncio.to_thread, the call sees the caller's context variables (e.g. the current span)
+        future = self._pool.submit(contextvars.copy_context().run, work)
+        future.add_done_callback(self._release)
+        # Cancelling the caller drops a call that is still queued; a running one finishes on its thread
+        return await asyncio.wrap_future(future)
+
+    def stats(self):
+        waits = sorted(self.waits)
+        return {
+            **self.counters,
+            "threads": self.threads,
+            "queue_limit": self.queue_limit,
+            "running": self.running,
+            "queued": self.pending - self.running,
+            "wait_p95": round(waits[int(0.95 * (len(waits) - 1))], 4) if waits else None,
+        }
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+_executors = {}
+
+
+def source_executor(source):
+    if source not in _executors:
+        _executors[source] = SourceExecutor(
+            source,
+            threads=_source_setting("SOURCE_THREADS", source, SOURCE_THREADS),
+            queue_limit=_source_setting("SOURCE_QUEUE", source, SOURCE_QUEUE),
+        )
+    return _executors[source]
+
+
+def executor_stats():
+    return {name: executor.stats() for name, executor in _executors.items()}
+
+
+def shutdown_executors():
+    for executor in _executors.values():
+        executor.shutdown()
+    _executors.clear()
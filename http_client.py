@@ -0,0 +1,97 @@
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from urllib.parse import urlsplit
+
+import httpx
+from dotenv import load_dotenv
+
+# ✅ Load environment variables
+load_dotenv()
+
+# ✅ Pool settings (override via .env)
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE = int(os.getenv("HTTP_MAX_KEEPALIVE", "20"))
+HTTP_PER_HOST_LIMIT = int(os.getenv("HTTP_PER_HOST_LIMIT", "10"))
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "10"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+
+_client = None
+_host_limits = {}
+
+
+def _build_client():
+    """Builds the shared keep-alive client, preferring HTTP/2 when `h2` is installed."""
+    try:
+        import h2  # noqa: F401
+        http2 = True
+    except ImportError:
+        http2 = False
+
+    return httpx.AsyncClient(
+        http2=http2,
+        timeout=httpx.Timeout(HTTP_TIMEOUT),
+        limits=httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+        ),
+        follow_redirects=True,
+    )
+
+
+async def open_http_client():
+    """Creates the process-wide client. Called once from the FastAPI lifespan."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = _build_client()
+    return _client
+
+
+async def close_http_client():
+    """Closes the process-wide client and drops its pooled connections."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+    _client = None
+    _host_limits.clear()
+
+
+def get_http_client():
+    """Returns the shared client, creating it lazily for scripts that skip the lifespan."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = _build_client()
+    return _client
+
+
+def _host_semaphore(url):
+    host = urlsplit(url).netloc
+    if host not in _host_limits:
+        _host_limits[host] = asyncio.Semaphore(HTTP_PER_HOST_LIMIT)
+    return _host_limits[host]
+
+
+async def fetch(url, params=None, **kwargs):
+    """GETs `url` on the shared client, capped at HTTP_PER_HOST_LIMIT in-flight requests per host."""
+    async with _host_semaphore(url):
+        response = await get_http_client().get(url, params=params, **kwargs)
+    response.raise_for_status()
+    return response
+
+
+async def post(url, json=None, **kwargs):
+    """POSTs `json` to `url` on the shared client, under the same per-host cap as `fetch`."""
+    async with _host_semaphore(url):
+        response = await get_http_client().post(url, json=json, **kwargs)
+    response.raise_for_status()
+    return response
+
+
+@asynccontextmanager
+async def stream(url, params=None, **kwargs):
+    """Streams a GET response on the shared client under the same per-host cap as `fetch`."""
+    async with _host_semaphore(url):
+        async with get_http_client().stream("GET", url, params=params, **kwargs) as response:
+            response.raise_for_status()
+            yield response
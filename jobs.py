@@ -0,0 +1,244 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from dotenv import load_dotenv
+
+# ✅ Load environment variables
+load_dotenv()
+
+JOB_STORE_PATH = os.getenv("JOB_STORE_PATH", "jobs.sqlite3")
+# Research jobs each worker process runs at once
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+# A running job whose worker stops renewing its lease for this long is handed to another worker
+JOB_LEASE = float(os.getenv("JOB_LEASE", "30"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+JOB_TIMEOUT = float(os.getenv("JOB_TIMEOUT", "300"))
+# How often idle workers and long-polls recheck the store for work done by other processes
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "1.0"))
+JOB_RETENTION = float(os.getenv("JOB_RETENTION", "86400"))
+
+FINISHED = ("done", "failed")
+_COLUMNS = "id, query, budget, sources, status, attempts, created_at, started_at, finished_at, result, error"
+
+
+class JobStore:
+    """Research jobs in a SQLite file shared by every uvicorn worker.
+
+    A job is queued, claimed by one worker under a lease it keeps renewing,
+    then done or failed. If the worker dies, its lease runs out and another
+    worker picks the job up again, up to JOB_MAX_ATTEMPTS claims in total.
+    """
+
+    def __init__(self, path=JOB_STORE_PATH):
+        self.path = path
+        self._db = None
+        self._db_lock = threading.Lock()
+        # Wakes this process's idle workers and long-polls without waiting for the next poll
+        self._changed = asyncio.Event()
+        self.counters = {"submitted": 0, "claimed": 0, "reclaimed": 0, "done": 0, "failed": 0}
+
+    # ✅ SQLite (blocking; always called through asyncio.to_thread)
+    def _connect(self):
+        if self._db is None:
+            db = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "id TEXT PRIMARY KEY, query TEXT, budget REAL, sources TEXT, status TEXT, attempts INTEGER, "
+                "created_at REAL, started_at REAL, finished_at REAL, lease_expires REAL, worker TEXT, "
+                "result TEXT, error TEXT)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS jobs_by_status ON jobs (status, created_at)")
+            self._db = db
+        return self._db
+
+    def _execute(self, sql, params=()):
+        with self._db_lock:
+            return self._connect().execute(sql, params).fetchall()
+
+    def _insert(self, job_id, query, budget, sources):
+        self._execute(
+            "INSERT INTO jobs (id, query, budget, sources, status, attempts, created_at) VALUES (?, ?, ?, ?, 'queued', 0, ?)",
+            (job_id, query, budget, json.dumps(sources), time.time()),
+        )
+
+    def _claim(self, worker):
+        """Takes the oldest queued job, or one whose lease ran out, in a single statement."""
+        now = time.time()
+        with self._db_lock:
+            db = self._connect()
+            # Jobs that already used all their claims fail instead of crashing yet another worker
+            db.execute(
+                "UPDATE jobs SET status = 'failed', finished_at = ?, error = 'worker lost too many times' "
+                "WHERE status = 'running' AND lease_expires < ? AND attempts >= ?",
+                (now, now, JOB_MAX_ATTEMPTS),
+            )
+            row = db.execute(
+                "UPDATE jobs SET status = 'running', attempts = attempts + 1, started_at = ?, lease_expires = ?, "
+                "worker = ? WHERE id = (SELECT id FROM jobs WHERE status = 'queued' "
+                "OR (status = 'running' AND lease_expires < ?) ORDER BY created_at LIMIT 1) "
+                "RETURNING id, query, budget, sources, attempts",
+                (now, now + JOB_LEASE, worker, now),
+            ).fetchone()
+        if row is None:
+            return None
+        job_id, query, budget, sources, attempts = row
+        return {"id": job_id, "query": query, "budget": budget, "sources": json.loads(sources), "attempts": attempts}
+
+    def _renew(self, job_id, worker):
+        self._execute(
+            "UPDATE jobs SET lease_expires = ? WHERE id = ? AND worker = ? AND status = 'running'",
+            (time.time() + JOB_LEASE, job_id, worker),
+        )
+
+    def _finish(self, job_id, worker, status, result=None, error=None):
+        # Only the worker holding the lease may finish the job; a reclaimed job belongs to its new worker
+        self._execute(
+            "UPDATE jobs SET status = ?, finished_at = ?, result = ?, error = ?, lease_expires = NULL "
+            "WHERE id = ? AND worker = ? AND status = 'running'",
+            (status, time.time(), json.dumps(result) if result is not None else None, error, job_id, worker),
+        )
+
+    def _release(self, job_id, worker):
+        """Puts an interrupted job back in the queue without spending one of its attempts."""
+        self._execute(
+            "UPDATE jobs SET status = 'queued', attempts = attempts - 1, lease_expires = NULL, worker = NULL "
+            "WHERE id = ? AND worker = ? AND status = 'running'",
+            (job_id, worker),
+        )
+
+    def _sweep(self):
+        self._execute(
+            "DELETE FROM jobs WHERE status IN ('done', 'failed') AND finished_at < ?", (time.time() - JOB_RETENTION,)
+        )
+
+    def _get(self, job_id):
+        rows = self._execute(f"SELECT {_COLUMNS} FROM jobs WHERE id = ?", (job_id,))
+        if not rows:
+            return None
+        job = dict(zip(_COLUMNS.split(", "), rows[0]))
+        job["sources"] = json.loads(job["sources"])
+        job["result"] = json.loads(job["result"]) if job["result"] is not None else None
+        return job
+
+    def _counts(self):
+        return dict(self._execute("SELECT status, COUNT(*) FROM jobs GROUP BY status"))
+
+    def _notify(self):
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    # ✅ Async API
+    async def submit(self, query, budget=None, sources=None):
+        """Queues a research job and returns its ID."""
+        job_id = uuid.uuid4().hex
+        await asyncio.to_thread(self._insert, job_id, query, budget, sources)
+        self.counters["submitted"] += 1
+        self._notify()
+        return job_id
+
+    async def get(self, job_id, wait=0):
+        """Returns the job (None if unknown), waiting up to `wait` seconds for it to finish."""
+        deadline = time.monotonic() + wait
+        while True:
+            changed = self._changed
+            job = await asyncio.to_thread(self._get, job_id)
+            remaining = deadline - time.monotonic()
+            if job is None or job["status"] in FINISHED or remaining <= 0:
+                return job
+            try:
+                await asyncio.wait_for(changed.wait(), min(remaining, JOB_POLL_INTERVAL))
+            except asyncio.TimeoutError:
+                pass
+
+    async def stats(self):
+        return {**self.counters, "jobs": await asyncio.to_thread(self._counts)}
+
+    def close(self):
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+            self._db = None
+
+
+class JobWorkers:
+    """Pool of asyncio workers that claim jobs from `store` and run them with `run(job)`.
+
+    `run` returns the job's JSON-serializable result. On shutdown, jobs still
+    running go back to the queue for the next worker or restart.
+    """
+
+    def __init__(self, store, run, workers=JOB_WORKERS):
+        self.store = store
+        self.run = run
+        self.workers = workers
+        self._tasks = []
+
+    async def _run_job(self, job, worker):
+        async def renew():
+            while True:
+                await asyncio.sleep(JOB_LEASE / 3)
+                await asyncio.to_thread(self.store._renew, job["id"], worker)
+
+        lease = asyncio.create_task(renew())
+        try:
+            result = await asyncio.wait_for(self.run(job), JOB_TIMEOUT)
+        except asyncio.TimeoutError:
+            print(f"⏱️ Job {job['id']} timed out after {JOB_TIMEOUT}s")
+            await asyncio.to_thread(self.store._finish, job["id"], worker, "failed", None, "timeout")
+            self.store.counters["failed"] += 1
+        except asyncio.CancelledError:
+            await asyncio.shield(asyncio.to_thread(self.store._release, job["id"], worker))
+            raise
+        except Exception as e:
+            print(f"❌ Job {job['id']} failed: {e}")
+            await asyncio.to_thread(self.store._finish, job["id"], worker, "failed", None, str(e))
+            self.store.counters["failed"] += 1
+        else:
+            await asyncio.to_thread(self.store._finish, job["id"], worker, "done", result)
+            self.store.counters["done"] += 1
+        finally:
+            lease.cancel()
+        self.store._notify()
+
+    async def _work(self, worker):
+        while True:
+            changed = self.store._changed
+            try:
+                job = await asyncio.to_thread(self.store._claim, worker)
+            except sqlite3.Error as e:
+                print(f"⚠️ Job store unavailable: {e}")
+                job = None
+            if job is None:
+                try:
+                    await asyncio.wait_for(changed.wait(), JOB_POLL_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            self.store.counters["reclaimed" if job["attempts"] > 1 else "claimed"] += 1
+            await self._run_job(job, worker)
+
+    async def _sweep(self):
+        while True:
+            await asyncio.to_thread(self.store._sweep)
+            await asyncio.sleep(3600)
+
+    def start(self):
+        if not self._tasks:
+            prefix = f"{os.getpid()}-{uuid.uuid4().hex[:6]}"
+            self._tasks = [asyncio.create_task(self._work(f"{prefix}-{i}")) for i in range(self.workers)]
+            self._tasks.append(asyncio.create_task(self._sweep()))
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+
+# ✅ Process-wide job store shared by every request
+job_store = JobStore()
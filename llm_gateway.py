@@ -0,0 +1,217 @@
+import asyncio
+import os
+import random
+import time
+from collections import deque
+
+from dotenv import load_dotenv
+
+from telemetry import tracer, LLM_CALLS, LLM_LATENCY, LLM_SLOTS, LLM_TOKENS, LOOP_LAG
+
+# ✅ Load environment variables
+load_dotenv()
+
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+LLM_MIN_CONCURRENCY = int(os.getenv("LLM_MIN_CONCURRENCY", "1"))
+LLM_RATE_LIMIT_RETRIES = int(os.getenv("LLM_RATE_LIMIT_RETRIES", "3"))
+LOOP_LAG_INTERVAL = float(os.getenv("LOOP_LAG_INTERVAL", "0.5"))
+
+
+def _is_rate_limit(error):
+    import openai
+    return isinstance(error, openai.RateLimitError)
+
+
+def _percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))]
+
+
+class AdaptiveLimiter:
+    """Concurrency cap that halves on rate limits and grows back by one after a window of successes."""
+
+    def __init__(self, limit, minimum=1):
+        self.maximum = limit
+        self.minimum = minimum
+        self.limit = limit
+        self.active = 0
+        self._successes = 0
+        self._cond = asyncio.Condition()
+
+    async def acquire(self):
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.active < self.limit)
+            self.active += 1
+
+    async def release(self):
+        async with self._cond:
+            self.active -= 1
+            self._cond.notify_all()
+
+    async def on_success(self):
+        async with self._cond:
+            self._successes += 1
+            if self._successes >= self.limit and self.limit < self.maximum:
+                self.limit += 1
+                self._successes = 0
+                self._cond.notify_all()
+
+    async def on_rate_limit(self):
+        async with self._cond:
+            self.limit = max(self.minimum, self.limit // 2)
+            self._successes = 0
+
+
+class LLMGateway:
+    """Single async entry point for every chat-model call.
+
+    Calls never block the event loop, run under an adaptive concurrency cap,
+    and back off with jitter on 429s. Latency, token usage and event-loop
+    lag are recorded for /stats and, labelled with `name`, for /metrics.
+    """
+
+    def __init__(self, model_factory, name="llm", max_concurrency=LLM_MAX_CONCURRENCY,
+                 min_concurrency=LLM_MIN_CONCURRENCY):
+        self._model_factory = model_factory
+        self.name = name
+        self.limiter = AdaptiveLimiter(max_concurrency, min_concurrency)
+        self.latencies = deque(maxlen=512)
+        self.loop_lags = deque(maxlen=512)
+        self.counters = {
+            "calls": 0,
+            "errors": 0,
+            "rate_limited": 0,
+            "input_tokens": 0,
+            "output_tokens": 0,
+        }
+        self._lag_task = None
+        LLM_SLOTS.labels(name, "active").set_function(lambda: self.limiter.active)
+        LLM_SLOTS.labels(name, "limit").set_function(lambda: self.limiter.limit)
+
+    @property
+    def model(self):
+        """The chat model, built by the factory on first call so importing the gateway stays cheap."""
+        return self._model_factory()
+
+    def _record_usage(self, usage, span):
+        if usage:
+            for kind in ("input_tokens", "output_tokens"):
+                tokens = usage.get(kind, 0)
+                self.counters[kind] += tokens
+                LLM_TOKENS.labels(self.name, kind.removesuffix("_tokens")).inc(tokens)
+                span.set_attribute(f"llm.{kind}", tokens)
+
+    def _record_call(self, outcome, seconds=None):
+        LLM_CALLS.labels(self.name, outcome).inc()
+        if seconds is not None:
+            self.latencies.append(seconds)
+            LLM_LATENCY.labels(self.name).observe(seconds)
+
+    @staticmethod
+    def _backoff(attempt, error):
+        retry_after = getattr(getattr(error, "response", None), "headers", {}).get("retry-after")
+        if retry_after:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass
+        return (2 ** attempt) * 0.5 + random.uniform(0, 0.5)
+
+    async def ainvoke(self, prompt):
+        """Runs one completion and returns the model's message."""
+        with tracer.start_as_current_span(f"llm.{self.name}") as span:
+            for attempt in range(LLM_RATE_LIMIT_RETRIES + 1):
+                await self.limiter.acquire()
+                started = time.perf_counter()
+                try:
+                    message = await self.model.ainvoke(prompt)
+                except Exception as e:
+                    if not _is_rate_limit(e) or attempt == LLM_RATE_LIMIT_RETRIES:
+                        self.counters["errors"] += 1
+                        self._record_call("error")
+                        raise
+                    self.counters["rate_limited"] += 1
+                    self._record_call("rate_limited")
+                    await self.limiter.on_rate_limit()
+                    error = e
+                else:
+                    self.counters["calls"] += 1
+                    self._record_call("ok", time.perf_counter() - started)
+                    self._record_usage(getattr(message, "usage_metadata", None), span)
+                    await self.limiter.on_success()
+                    return message
+                finally:
+                    await self.limiter.release()
+
+                await asyncio.sleep(self._backoff(attempt, error))
+
+    async def astream(self, prompt):
+        """Streams one completion chunk by chunk, holding a slot until the stream ends."""
+        # Not the current span: the consumer may resume this generator from another context
+        span = tracer.start_span(f"llm.{self.name}", attributes={"llm.stream": True})
+        try:
+            for attempt in range(LLM_RATE_LIMIT_RETRIES + 1):
+                await self.limiter.acquire()
+                started = time.perf_counter()
+                streamed = False
+                try:
+                    async for chunk in self.model.astream(prompt):
+                        streamed = True
+                        self._record_usage(getattr(chunk, "usage_metadata", None), span)
+                        yield chunk
+                except Exception as e:
+                    if not _is_rate_limit(e) or streamed or attempt == LLM_RATE_LIMIT_RETRIES:
+                        self.counters["errors"] += 1
+                        self._record_call("error")
+                        span.record_exception(e)
+                        raise
+                    self.counters["rate_limited"] += 1
+                    self._record_call("rate_limited")
+                    await self.limiter.on_rate_limit()
+                    error = e
+                else:
+                    self.counters["calls"] += 1
+                    self._record_call("ok", time.perf_counter() - started)
+                    await self.limiter.on_success()
+                    return
+                finally:
+                    await self.limiter.release()
+
+                await asyncio.sleep(self._backoff(attempt, error))
+        finally:
+            span.end()
+
+    # ✅ Event-loop lag monitor: how late a short sleep wakes up
+    async def _watch_loop_lag(self):
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(LOOP_LAG_INTERVAL)
+            lag = max(0.0, time.perf_counter() - started - LOOP_LAG_INTERVAL)
+            self.loop_lags.append(lag)
+            LOOP_LAG.observe(lag)
+
+    def start_lag_monitor(self):
+        if self._lag_task is None:
+            self._lag_task = asyncio.create_task(self._watch_loop_lag())
+
+    async def stop_lag_monitor(self):
+        if self._lag_task is not None:
+            self._lag_task.cancel()
+            try:
+                await self._lag_task
+            except asyncio.CancelledError:
+                pass
+        self._lag_task = None
+
+    def stats(self):
+        return {
+            **self.counters,
+            "concurrency_limit": self.limiter.limit,
+            "active": self.limiter.active,
+            "latency_p50": round(_percentile(self.latencies, 50), 4),
+            "latency_p95": round(_percentile(self.latencies, 95), 4),
+            "loop_lag_last": round(self.loop_lags[-1], 4) if self.loop_lags else 0.0,
+            "loop_lag_max": round(max(self.loop_lags, default=0.0), 4),
+        }
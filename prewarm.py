@@ -0,0 +1,153 @@
+import asyncio
+import math
+import os
+import time
+from dotenv import load_dotenv
+
+from cache import normalize_query
+
+# ✅ Load environment variables
+load_dotenv()
+
+# ✅ How many of the most popular topics to keep warm (0 turns prewarming off) and how often to check them
+PREWARM_TOP_N = int(os.getenv("PREWARM_TOP_N", "10"))
+PREWARM_INTERVAL = float(os.getenv("PREWARM_INTERVAL", "60"))
+# Refresh a topic's report once it is this close to expiring
+PREWARM_LEAD = float(os.getenv("PREWARM_LEAD", "120"))
+# A topic must have been asked about at least this often (decayed) to be prewarmed
+PREWARM_MIN_SCORE = float(os.getenv("PREWARM_MIN_SCORE", "2"))
+PREWARM_CONCURRENCY = int(os.getenv("PREWARM_CONCURRENCY", "2"))
+# A topic whose refresh cached no report waits PREWARM_INTERVAL, then twice that, ... up to this long
+PREWARM_MAX_BACKOFF = float(os.getenv("PREWARM_MAX_BACKOFF", "3600"))
+# Popularity halves after this many seconds without requests
+POPULARITY_HALF_LIFE = float(os.getenv("POPULARITY_HALF_LIFE", "3600"))
+POPULARITY_TRACKED = int(os.getenv("POPULARITY_TRACKED", "1000"))
+
+
+def topic_key(query, sources=None):
+    return normalize_query(query), tuple(sorted(sources or ()))
+
+
+class QueryPopularity:
+    """Exponentially decayed request counts per (query, sources), so recent interest outweighs old."""
+
+    def __init__(self, half_life=POPULARITY_HALF_LIFE, tracked=POPULARITY_TRACKED):
+        self.decay = math.log(2) / half_life
+        self.tracked = tracked
+        self._topics = {}
+
+    def _score(self, topic, now):
+        return topic["score"] * math.exp(-self.decay * (now - topic["seen"]))
+
+    def record(self, query, sources=None):
+        now = time.time()
+        key = topic_key(query, sources)
+        topic = self._topics.get(key)
+        if topic is None:
+            if len(self._topics) >= self.tracked:
+                # Forget the least popular topic to stay bounded
+                del self._topics[min(self._topics, key=lambda k: self._score(self._topics[k], now))]
+            topic = self._topics[key] = {"query": query, "sources": sources, "score": 0.0, "seen": now}
+        topic["score"] = self._score(topic, now) + 1
+        topic["seen"] = now
+
+    def top(self, n, min_score=0.0):
+        """The `n` most popular topics scoring at least `min_score`, as (query, sources, score)."""
+        now = time.time()
+        scored = [(self._score(topic, now), topic) for topic in self._topics.values()]
+        scored = sorted((item for item in scored if item[0] >= min_score), key=lambda item: item[0], reverse=True)
+        return [(topic["query"], topic["sources"], score) for score, topic in scored[:n]]
+
+    def __len__(self):
+        return len(self._topics)
+
+
+class PrewarmScheduler:
+    """Re-researches the most popular topics shortly before their cached reports expire.
+
+    `expires_at(query, sources)` says when a topic's report expires (None if
+    none is cached) and `refresh(query, sources)` returns an awaitable that
+    researches it again and caches the result. A refresh that leaves no
+    fresh report behind (it failed, or the report was not cacheable) backs
+    the topic off exponentially instead of paying for it again every tick.
+    """
+
+    def __init__(self, popularity, expires_at, refresh, top_n=PREWARM_TOP_N):
+        self.popularity = popularity
+        self.expires_at = expires_at
+        self.refresh = refresh
+        self.top_n = top_n
+        self._slots = asyncio.Semaphore(PREWARM_CONCURRENCY)
+        self._task = None
+        # topic key -> (consecutive failed refreshes, time.time() before which it is skipped)
+        self._backoff = {}
+        self.counters = {"checks": 0, "refreshed": 0, "failed": 0, "backed_off": 0}
+
+    def _due(self, query, sources):
+        return (self.expires_at(query, sources) or 0) - time.time() < PREWARM_LEAD
+
+    async def _refresh(self, query, sources):
+        async with self._slots:
+            try:
+                await self.refresh(query, sources)
+            except Exception as e:
+                print(f"⚠️ Prewarming '{query}' failed: {e}")
+            key = topic_key(query, sources)
+            if not self._due(query, sources):
+                self.counters["refreshed"] += 1
+                self._backoff.pop(key, None)
+                return
+            self.counters["failed"] += 1
+            failures = self._backoff.get(key, (0, 0))[0] + 1
+            self._backoff[key] = (failures, time.time() + min(PREWARM_MAX_BACKOFF, PREWARM_INTERVAL * 2 ** failures))
+
+    async def run_once(self):
+        """Refreshes every popular topic whose report is missing or about to expire."""
+        self.counters["checks"] += 1
+        now = time.time()
+        top = self.popularity.top(self.top_n, PREWARM_MIN_SCORE)
+        # Topics that fell out of the top start over if they come back
+        keys = {topic_key(query, sources) for query, sources, _ in top}
+        self._backoff = {key: backoff for key, backoff in self._backoff.items() if key in keys}
+        due = []
+        for query, sources, _ in top:
+            if not self._due(query, sources):
+                continue
+            if self._backoff.get(topic_key(query, sources), (0, 0))[1] > now:
+                self.counters["backed_off"] += 1
+                continue
+            due.append((query, sources))
+        await asyncio.gather(*(self._refresh(query, sources) for query, sources in due))
+
+    async def _loop(self):
+        while True:
+            await asyncio.sleep(PREWARM_INTERVAL)
+            await self.run_once()
+
+    def start(self):
+        if self._task is None and self.top_n > 0:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    def stats(self):
+        return {
+            **self.counters,
+            "tracked": len(self.popularity),
+            "backing_off": sum(retry_at > time.time() for _, retry_at in self._backoff.values()),
+            "top": [
+                {"query": query, "sources": sources, "score": round(score, 2)}
+                for query, sources, score in self.popularity.top(self.top_n)
+            ],
+        }
+
+
+# ✅ Process-wide popularity, fed by every research run in this worker
+query_popularity = QueryPopularity()
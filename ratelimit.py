@@ -0,0 +1,167 @@
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from dotenv import load_dotenv
+
+# ✅ Load environment variables
+load_dotenv()
+
+RATE_LIMIT_PATH = os.getenv("RATE_LIMIT_PATH", "rate_limits.sqlite3")
+RATE_LIMIT_MAX_WAIT = float(os.getenv("RATE_LIMIT_MAX_WAIT", "1.0"))
+
+# ✅ (requests per second, burst, daily quota in units, units per call); None = no daily quota.
+# NewsAPI's free plan allows 100 requests/day; a YouTube search costs 100 of the 10,000 daily units;
+# Reddit OAuth clients get 100 requests/minute.
+DEFAULT_LIMITS = {
+    "NewsAPI": (1.0, 5, 100, 1),
+    "YouTube": (1.0, 5, 10000, 100),
+    "Reddit": (100 / 60, 10, None, 1),
+}
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a source has no budget left within the allowed wait."""
+
+    def __init__(self, source, reason):
+        super().__init__(f"{source} {reason}")
+        self.source = source
+        self.reason = reason
+
+
+def _limit_setting(source, name, default):
+    value = os.getenv(f"RATE_LIMIT_{source.upper().replace(' ', '_')}_{name}")
+    if value is None:
+        return default
+    return None if value.lower() == "none" else float(value)
+
+
+class RateLimiter:
+    """Token-bucket rate limiter with daily quotas, stored in SQLite so every worker shares one budget.
+
+    Each acquire runs in one IMMEDIATE transaction, so concurrent workers never
+    spend the same token twice.
+    """
+
+    def __init__(self, path=RATE_LIMIT_PATH):
+        self.path = path
+        self.limits = {
+            source: (
+                _limit_setting(source, "RATE", rate),
+                _limit_setting(source, "BURST", burst),
+                _limit_setting(source, "DAILY", quota),
+                _limit_setting(source, "COST", cost),
+            )
+            for source, (rate, burst, quota, cost) in DEFAULT_LIMITS.items()
+        }
+        self._db = None
+        self._db_lock = threading.Lock()
+        self.counters = {"granted": 0, "waited": 0, "rejected": 0}
+
+    def _connect(self):
+        if self._db is None:
+            db = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS buckets ("
+                "source TEXT PRIMARY KEY, tokens REAL, updated_at REAL, day TEXT, used_today REAL)"
+            )
+            self._db = db
+        return self._db
+
+    def _take(self, source):
+        """Returns 0 when a token was taken, the seconds to wait for the next one, or None if the day's quota is spent."""
+        rate, burst, quota, cost = self.limits[source]
+        now = time.time()
+        today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+        with self._db_lock:
+            db = self._connect()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                row = db.execute(
+                    "SELECT tokens, updated_at, day, used_today FROM buckets WHERE source = ?", (source,)
+                ).fetchone()
+                tokens, updated_at, day, used = row if row else (burst, now, today, 0)
+                tokens = min(burst, tokens + (now - updated_at) * rate)
+                if day != today:
+                    day, used = today, 0
+
+                if quota is not None and used + cost > quota:
+                    wait = None
+                elif tokens >= 1:
+                    tokens -= 1
+                    used += cost
+                    wait = 0
+                else:
+                    wait = (1 - tokens) / rate
+
+                db.execute(
+                    "INSERT OR REPLACE INTO buckets (source, tokens, updated_at, day, used_today) VALUES (?, ?, ?, ?, ?)",
+                    (source, tokens, now, day, used),
+                )
+                db.execute("COMMIT")
+            except Exception:
+                db.execute("ROLLBACK")
+                raise
+        return wait
+
+    async def acquire(self, source, max_wait=RATE_LIMIT_MAX_WAIT):
+        """Takes one call's worth of budget for `source`, queueing up to `max_wait` seconds for a token."""
+        if source not in self.limits:
+            return
+
+        waited = 0.0
+        while True:
+            wait = await asyncio.to_thread(self._take, source)
+            if wait == 0:
+                self.counters["granted"] += 1
+                return
+            if wait is None:
+                self.counters["rejected"] += 1
+                raise RateLimitExceeded(source, "daily quota exhausted")
+            if waited + wait > max_wait:
+                self.counters["rejected"] += 1
+                raise RateLimitExceeded(source, "rate limit reached")
+            self.counters["waited"] += 1
+            waited += wait
+            await asyncio.sleep(wait)
+
+    def _snapshot(self):
+        with self._db_lock:
+            rows = self._connect().execute(
+                "SELECT source, tokens, updated_at, day, used_today FROM buckets"
+            ).fetchall()
+        return {row[0]: row[1:] for row in rows}
+
+    async def quotas(self):
+        """Current budget per limited source, for the /quota endpoint."""
+        rows = await asyncio.to_thread(self._snapshot)
+        now = time.time()
+        today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+        report = {}
+        for source, (rate, burst, quota, cost) in self.limits.items():
+            tokens, updated_at, day, used = rows.get(source, (burst, now, today, 0))
+            used = used if day == today else 0
+            report[source] = {
+                "rate_per_second": rate,
+                "burst": burst,
+                "tokens": round(min(burst, tokens + (now - updated_at) * rate), 3),
+                "daily_quota": quota,
+                "cost_per_call": cost,
+                "used_today": used,
+                "remaining_today": None if quota is None else max(0, quota - used),
+            }
+        return {"sources": report, **self.counters}
+
+    def close(self):
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+            self._db = None
+
+
+# ✅ Process-wide limiter; the SQLite file is what workers actually share
+rate_limiter = RateLimiter()
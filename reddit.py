@@ -1,4 +1,3 @@
-import asyncpraw
 import os
 import asyncio
 from dotenv import load_dotenv
@@ -10,39 +9,114 @@ load_dotenv()
 REDDIT_CLIENT_ID = os.getenv("REDDIT_CLIENT_ID")
 REDDIT_CLIENT_SECRET = os.getenv("REDDIT_CLIENT_SECRET")
 REDDIT_USER_AGENT = os.getenv("REDDIT_USER_AGENT")
+# Optional endpoint overrides (e.g. local stand-ins for load tests)
+REDDIT_URL = os.getenv("REDDIT_URL")
+REDDIT_OAUTH_URL = os.getenv("REDDIT_OAUTH_URL")
+
+# Pool settings
+REDDIT_MAX_CONCURRENCY = int(os.getenv("REDDIT_MAX_CONCURRENCY", "4"))
+REDDIT_MAX_CONNECTIONS = int(os.getenv("REDDIT_MAX_CONNECTIONS", "10"))
+
+
+def _parse_submission(submission):
+    return {
+        "title": submission.title,
+        "url": f"https://reddit.com{submission.permalink}",
+        "score": submission.score,
+    }
+
+
+class RedditClientManager:
+    """Owns one long-lived asyncpraw.Reddit (and its aiohttp session) for the whole process.
+
+    asyncprawcore keeps the OAuth token on the client's authorizer and only
+    refreshes it once it expires, so reusing one client removes the token
+    round-trip from every search. A semaphore bounds concurrent searches.
+    """
+
+    def __init__(self, max_concurrency=REDDIT_MAX_CONCURRENCY):
+        self._reddit = None
+        self._lock = asyncio.Lock()
+        self._slots = asyncio.Semaphore(max_concurrency)
+
+    async def open(self):
+        """Creates the client and fetches the OAuth token ahead of the first search."""
+        async with self._lock:
+            if self._reddit is not None:
+                return self._reddit
+
+            # asyncpraw and aiohttp are imported here so importing this module stays cheap
+            import asyncpraw
+            from aiohttp import ClientSession, TCPConnector
+
+            session = ClientSession(connector=TCPConnector(limit=REDDIT_MAX_CONNECTIONS))
+            endpoints = {"reddit_url": REDDIT_URL, "oauth_url": REDDIT_OAUTH_URL}
+            try:
+                self._reddit = asyncpraw.Reddit(
+                    client_id=REDDIT_CLIENT_ID,
+                    client_secret=REDDIT_CLIENT_SECRET,
+                    user_agent=REDDIT_USER_AGENT,
+                    requestor_kwargs={"session": session},
+                    **{key: url for key, url in endpoints.items() if url},
+                )
+            except Exception:
+                # e.g. missing credentials; nothing owns the session yet, so close it here
+                await session.close()
+                raise
+            await self._warm_token()
+            return self._reddit
+
+    async def _warm_token(self):
+        authorizer = getattr(getattr(self._reddit, "_core", None), "_authorizer", None)
+        if authorizer is None:
+            return
+        try:
+            if not authorizer.is_valid():
+                await authorizer.refresh()
+        except Exception as e:
+            print(f"⚠️ Reddit token prefetch failed, will retry on first search: {e}")
+
+    async def close(self):
+        """Closes the client and its session. Safe to call more than once."""
+        async with self._lock:
+            if self._reddit is not None:
+                await self._reddit.close()
+            self._reddit = None
+
+    async def search(self, query, limit=5):
+        """Runs one global search, waiting for a free slot if too many are in flight."""
+        reddit = self._reddit or await self.open()
+
+        async with self._slots:
+            subreddit = await reddit.subreddit("all")
+            posts = []
+
+            async for submission in subreddit.search(query, limit=limit, sort="relevance"):
+                posts.append(_parse_submission(submission))
+
+            return posts
+
+
+# Process-wide client; backend startup opens it and shutdown closes it
+reddit_client = RedditClientManager()
 
 
 async def fetch_reddit_posts(query, limit=5):
     """Searches Reddit globally for posts related to the query."""
-    reddit = asyncpraw.Reddit(
-        client_id=REDDIT_CLIENT_ID,
-        client_secret=REDDIT_CLIENT_SECRET,
-        user_agent=REDDIT_USER_AGENT,
-    )
-
     try:
-        subreddit = await reddit.subreddit("all")  # Ensure subreddit is awaited
-        posts = []
-        
-        async for submission in subreddit.search(query, limit=limit, sort="relevance"):
-            posts.append(
-                {
-                    "title": submission.title,
-                    "url": f"https://reddit.com{submission.permalink}",
-                    "score": submission.score,
-                }
-            )
-
-        await reddit.close()
-        return posts
+        return await reddit_client.search(query, limit=limit)
 
     except Exception as e:
         print(f"❌ Error searching Reddit: {e}")
         return []
 
+
+async def _main():
+    try:
+        print(await fetch_reddit_posts("AI trends 2025"))
     finally:
-        await reddit.close()
+        await reddit_client.close()
 
 
 if __name__ == "__main__":
-    asyncio.run(fetch_reddit_posts("AI trends 2025"))
+    asyncio.run(_main())
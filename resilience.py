@@ -0,0 +1,209 @@
+import asyncio
+import os
+import random
+import sys
+import time
+from collections import deque
+
+import httpx
+from dotenv import load_dotenv
+
+from executors import ExecutorSaturated
+from ratelimit import RateLimitExceeded, rate_limiter
+
+# ✅ Load environment variables
+load_dotenv()
+
+RETRY_ATTEMPTS = int(os.getenv("RETRY_ATTEMPTS", "2"))
+RETRY_BASE_DELAY = float(os.getenv("RETRY_BASE_DELAY", "0.2"))
+BREAKER_FAILURES = int(os.getenv("BREAKER_FAILURES", "5"))
+BREAKER_COOLDOWN = float(os.getenv("BREAKER_COOLDOWN", "30"))
+HEDGE_MIN_SAMPLES = int(os.getenv("HEDGE_MIN_SAMPLES", "20"))
+# Only hedge sources without tight quotas; a hedge costs a second upstream call
+HEDGE_SOURCES = {s.strip() for s in os.getenv("HEDGE_SOURCES", "Hacker News,Arxiv,Wikipedia").split(",") if s.strip()}
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a source whose circuit breaker is open."""
+
+
+def is_retryable(error):
+    """True for transient failures that are safe to retry: timeouts, dropped connections, 429s and 5xx."""
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code == 429 or error.response.status_code >= 500
+    if isinstance(error, (asyncio.TimeoutError, httpx.TransportError)):
+        return True
+
+    # requests and asyncprawcore are imported lazily elsewhere; if they are not loaded, their errors cannot occur
+    requests = sys.modules.get("requests")
+    if requests is not None:
+        if isinstance(error, requests.HTTPError) and error.response is not None:
+            return error.response.status_code == 429 or error.response.status_code >= 500
+        if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+            return True
+    prawcore = sys.modules.get("asyncprawcore.exceptions")
+    if prawcore is not None:
+        return isinstance(error, (prawcore.RequestException, prawcore.ServerError, prawcore.TooManyRequests))
+    return False
+
+
+def describe_error(error):
+    """A client-safe description of a source failure: the HTTP status or the exception type.
+
+    HTTP error messages embed the request URL, which carries API keys for
+    sources that pass them as query parameters, so they never leave the process.
+    """
+    response = getattr(error, "response", None)
+    status = getattr(response, "status_code", None)
+    if isinstance(status, int):
+        return f"HTTP {status}"
+    return type(error).__name__
+
+
+class ResilientSource:
+    """Retry, hedging and circuit-breaker policy for one upstream source.
+
+    After BREAKER_FAILURES consecutive failures the breaker opens: calls fail
+    fast with CircuitOpenError while a background task replays the last
+    failing call every BREAKER_COOLDOWN seconds until it succeeds. Without
+    `probe` (sources with a daily quota, where replays would spend it), no
+    background calls are made; instead one real call is let through per
+    BREAKER_COOLDOWN, and the breaker closes when it succeeds.
+    """
+
+    def __init__(self, name, hedge=False, probe=True):
+        self.name = name
+        self.hedge = hedge
+        self.probe = probe
+        self.latencies = deque(maxlen=200)
+        self.failures = 0
+        self.open = False
+        self._trial_at = 0.0
+        self._probe_task = None
+        self.counters = {"calls": 0, "retries": 0, "hedges": 0, "failures": 0, "rejected": 0, "opened": 0}
+
+    def p95(self):
+        if len(self.latencies) < HEDGE_MIN_SAMPLES:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[int(0.95 * (len(ordered) - 1))]
+
+    async def _attempt(self, call):
+        """One logical attempt; fires a hedged duplicate if the first passes this source's p95."""
+        delay = self.p95() if self.hedge else None
+        first = asyncio.ensure_future(call())
+        if delay is None:
+            return await first
+
+        done, _ = await asyncio.wait({first}, timeout=delay)
+        if done:
+            return first.result()
+
+        self.counters["hedges"] += 1
+        second = asyncio.ensure_future(call())
+        racers = {first, second}
+        try:
+            while racers:
+                done, racers = await asyncio.wait(racers, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+            # Both failed; surface the original attempt's error
+            return first.result()
+        finally:
+            for task in racers:
+                task.cancel()
+
+    async def call(self, call):
+        """Runs `call()` (a zero-argument coroutine factory) under this source's policy."""
+        if self.open:
+            if self.probe or time.monotonic() < self._trial_at:
+                self.counters["rejected"] += 1
+                raise CircuitOpenError(f"{self.name} circuit is open")
+            # Half-open: this call is the trial; others keep failing fast until it is back
+            self._trial_at = time.monotonic() + BREAKER_COOLDOWN
+
+        self.counters["calls"] += 1
+        for attempt in range(RETRY_ATTEMPTS + 1):
+            started = time.perf_counter()
+            try:
+                results = await self._attempt(call)
+            except (ExecutorSaturated, RateLimitExceeded):
+                # Our own pool or budget ran out; that says nothing about the upstream's health
+                raise
+            except Exception as e:
+                if attempt < RETRY_ATTEMPTS and is_retryable(e):
+                    self.counters["retries"] += 1
+                    await asyncio.sleep(RETRY_BASE_DELAY * (2 ** attempt) * random.uniform(0.5, 1.5))
+                    continue
+                self._record_failure(call)
+                raise
+            self.latencies.append(time.perf_counter() - started)
+            self.failures = 0
+            if self.open:
+                self.open = False
+                print(f"🔌 {self.name} circuit closed")
+            return results
+
+    def _record_failure(self, call):
+        self.counters["failures"] += 1
+        self.failures += 1
+        if not self.open and self.failures >= BREAKER_FAILURES:
+            self.open = True
+            self.counters["opened"] += 1
+            if self.probe:
+                print(f"🔌 {self.name} circuit opened after {self.failures} failures; probing in the background")
+                self._probe_task = asyncio.create_task(self._probe(call))
+            else:
+                print(f"🔌 {self.name} circuit opened after {self.failures} failures; next trial call in {BREAKER_COOLDOWN}s")
+                self._trial_at = time.monotonic() + BREAKER_COOLDOWN
+
+    async def _probe(self, call):
+        while self.open:
+            await asyncio.sleep(BREAKER_COOLDOWN)
+            try:
+                await call()
+            except Exception as e:
+                print(f"🔌 {self.name} probe failed: {describe_error(e)}")
+                continue
+            self.open = False
+            self.failures = 0
+            print(f"🔌 {self.name} circuit closed")
+        self._probe_task = None
+
+    def stats(self):
+        p95 = self.p95()
+        return {
+            **self.counters,
+            "state": "open" if self.open else "closed",
+            "consecutive_failures": self.failures,
+            "latency_p95": round(p95, 4) if p95 is not None else None,
+        }
+
+
+_sources = {}
+
+
+def source_policy(name):
+    if name not in _sources:
+        # Probes are extra upstream calls; a daily quota cannot afford one every BREAKER_COOLDOWN
+        quota_bound = rate_limiter.limits.get(name, (None,) * 4)[2] is not None
+        _sources[name] = ResilientSource(name, hedge=name in HEDGE_SOURCES, probe=not quota_bound)
+    return _sources[name]
+
+
+async def resilient_call(source, call):
+    """Runs `call()` for `source` with retries, optional hedging and a circuit breaker.
+
+    Every attempt, hedge and probe takes its own rate-limit token, so each
+    upstream call is counted against the source's budget.
+    """
+    async def limited():
+        await rate_limiter.acquire(source)
+        return await call()
+
+    return await source_policy(source).call(limited)
+
+
+def resilience_stats():
+    return {name: policy.stats() for name, policy in _sources.items()}
@@ -0,0 +1,262 @@
+import hashlib
+import json
+import os
+import re
+import time
+import zlib
+
+import numpy as np
+from dotenv import load_dotenv
+
+from cache import result_cache, normalize_query, source_ttl
+from sources import resolve_sources
+
+# ✅ Load environment variables
+load_dotenv()
+
+# ✅ Cosine similarity a paraphrase must reach to reuse a report, and how many reports to keep
+REPORT_CACHE_THRESHOLD = float(os.getenv("REPORT_CACHE_THRESHOLD", "0.9"))
+REPORT_CACHE_SIZE = int(os.getenv("REPORT_CACHE_SIZE", "512"))
+REPORT_CACHE_TTL = float(os.getenv("REPORT_CACHE_TTL", "3600"))
+# Reports built while some source had failed are kept this long, so a source outage is retried soon
+# without every request (or prewarm tick) paying for a new report
+REPORT_CACHE_PARTIAL_TTL = float(os.getenv("REPORT_CACHE_PARTIAL_TTL", "300"))
+# How long past expiry a report may still be served while a fresh one is researched in the background
+REPORT_CACHE_STALE_TTL = float(os.getenv("REPORT_CACHE_STALE_TTL", "86400"))
+
+# Hashing-vectorizer width; collisions are rare at this size for short queries
+EMBEDDING_DIM = 4096
+CHAR_NGRAM = 3
+
+# Filler words that do not change what a research query is about
+STOP_WORDS = {
+    "a", "an", "the", "of", "in", "on", "for", "to", "and", "or", "about", "with", "what", "whats", "is", "are",
+    "latest", "new", "recent", "current",
+}
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+# Words that flip a query's meaning when added; a paraphrase may add qualifiers, but not these
+NEGATIONS = {"not", "no", "without", "never", "non", "vs", "versus", "instead"}
+
+
+def query_terms(query):
+    """The words a query is about: lowercased, stop words dropped, plurals folded."""
+    terms = []
+    for word in _WORD.findall(query.lower()):
+        if word in STOP_WORDS:
+            continue
+        if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        terms.append(word)
+    return terms
+
+
+def embed_query(query):
+    """Embeds a query as an L2-normalized hashed bag of words and character trigrams.
+
+    Word order is ignored, so "AI trends 2025" and "2025 AI trends" embed the
+    same. Stop words are dropped, plurals are folded, and character trigrams
+    give near-miss spellings partial credit. Numbers stay whole words. Local
+    and CPU-only.
+    """
+    vector = np.zeros(EMBEDDING_DIM, dtype=np.float32)
+    for word in query_terms(query):
+        features = [word]
+        if len(word) > CHAR_NGRAM and not word.isdigit():
+            features += [word[i:i + CHAR_NGRAM] for i in range(len(word) - CHAR_NGRAM + 1)]
+        # Every word carries the same weight however many trigrams it has
+        weight = 1.0 / np.sqrt(len(features))
+        for feature in features:
+            h = zlib.crc32(feature.encode())
+            vector[h % EMBEDDING_DIM] += weight if h & 0x80000000 else -weight
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def is_typo(a, b):
+    """True when two words are one edit (or swap of neighbours) apart past a shared first two letters.
+
+    Keeps "kubernets"/"kubernetes" together while "install"/"uninstall",
+    "encrypt"/"decrypt" and "sync"/"async" stay different words.
+    """
+    if min(len(a), len(b)) < 4 or a[:2] != b[:2] or abs(len(a) - len(b)) > 1:
+        return False
+    if len(a) > len(b):
+        a, b = b, a
+    i = next((i for i, (x, y) in enumerate(zip(a, b)) if x != y), len(a))
+    if len(a) < len(b):
+        return a[i:] == b[i + 1:]
+    return a[i + 1:] == b[i + 1:] or (a[i + 2:] == b[i + 2:] and a[i:i + 2] == b[i:i + 2][::-1])
+
+
+def same_terms(a, b):
+    """Whether two queries' terms can be the same question, which trigram similarity alone cannot tell.
+
+    Trigrams give "install" almost full credit for "uninstall", so words the
+    queries do not share must be typos of each other. Only one query may add
+    words of its own (qualifiers), and never a negation.
+    """
+    only_a, only_b = set(a) - set(b), set(b) - set(a)
+    extra_a = {word for word in only_a if not any(is_typo(word, other) for other in only_b)}
+    extra_b = {word for word in only_b if not any(is_typo(word, other) for other in only_a)}
+    if extra_a and extra_b:
+        return False
+    return not (extra_a | extra_b) & NEGATIONS
+
+
+def query_numbers(query):
+    """Numbers in a query (years, versions); paraphrases must agree on them exactly."""
+    return frozenset(word for word in _WORD.findall(query.lower()) if word.isdigit())
+
+
+def fingerprint(results):
+    """Stable hash of one source's results. Every empty result ([] or Wikipedia's "") hashes the same."""
+    return hashlib.sha1(json.dumps(results or [], sort_keys=True, default=str).encode()).hexdigest()
+
+
+class SemanticReportCache:
+    """Caches final reports by query embedding, scoped to the set of sources that produced them.
+
+    A lookup finds the most similar earlier query with cosine similarity over
+    all stored embeddings at once, then checks its words with same_terms. The hit only counts if the results that
+    report was built from still match what the result cache holds for that
+    query now; otherwise the report is expired as outdated. Expired reports
+    stay available to lookup_stale for REPORT_CACHE_STALE_TTL.
+    """
+
+    def __init__(self, size=REPORT_CACHE_SIZE, threshold=REPORT_CACHE_THRESHOLD, ttl=REPORT_CACHE_TTL,
+                 stale_ttl=REPORT_CACHE_STALE_TTL, partial_ttl=REPORT_CACHE_PARTIAL_TTL):
+        self.threshold = threshold
+        self.ttl = ttl
+        self.partial_ttl = partial_ttl
+        self.stale_ttl = stale_ttl
+        self._vectors = np.zeros((size, EMBEDDING_DIM), dtype=np.float32)
+        self._entries = [None] * size
+        self._next = 0
+        self.counters = {"hits": 0, "semantic_hits": 0, "stale_hits": 0, "misses": 0, "invalidated": 0, "stored": 0,
+                         "stored_partial": 0}
+
+    @staticmethod
+    def _scope(sources):
+        return tuple(source.name for source in resolve_sources(sources))
+
+    async def _still_valid(self, entry):
+        """Re-fingerprints the matched query's currently cached results against the ones its report used.
+
+        Sources that had failed for a partial report are not checked; the report expires early instead.
+        """
+        for source in resolve_sources(entry["scope"]):
+            expected = entry["fingerprints"].get(source.name)
+            if expected is None:
+                continue
+            current = await result_cache.get(source.name, entry["query"], source.num_results)
+            if current is None:
+                # Empty results ([] or "") are never cached, so absence only means "changed" if there was something before
+                if expected != fingerprint([]):
+                    return False
+            elif fingerprint(current) != expected:
+                return False
+        return True
+
+    def _match(self, query, sources, until):
+        """Slot of the entry most similar to `query` that is still live by its `until` timestamp, or None."""
+        scope, numbers = self._scope(sources), query_numbers(query)
+        now = time.time()
+        live = [
+            i for i, entry in enumerate(self._entries)
+            if entry is not None and entry["scope"] == scope and entry["numbers"] == numbers and entry[until] > now
+        ]
+        if not live:
+            return None
+        similarities = self._vectors[live] @ embed_query(query)
+        terms = query_terms(query)
+        for best in np.argsort(-similarities):
+            if similarities[best] < self.threshold:
+                return None
+            if same_terms(terms, self._entries[live[best]]["terms"]):
+                return live[best]
+        return None
+
+    async def lookup(self, query, sources=None):
+        """Returns the cached {"final_response", "raw_results"} for `query` or a close paraphrase, else None."""
+        slot = self._match(query, sources, "expires_at")
+        if slot is None:
+            self.counters["misses"] += 1
+            return None
+
+        entry = self._entries[slot]
+        if not await self._still_valid(entry):
+            entry["expires_at"] = time.time()
+            self.counters["invalidated"] += 1
+            self.counters["misses"] += 1
+            return None
+
+        self.counters["hits"] += 1
+        if entry["query"] != normalize_query(query):
+            self.counters["semantic_hits"] += 1
+        return entry["response"]
+
+    def lookup_stale(self, query, sources=None):
+        """After lookup missed: returns (response, cached query) for an expired or outdated report that is still
+        within its stale window, else None."""
+        slot = self._match(query, sources, "stale_until")
+        if slot is None:
+            return None
+        self.counters["stale_hits"] += 1
+        entry = self._entries[slot]
+        return entry["response"], entry["query"]
+
+    def expires_at(self, query, sources=None):
+        """When the report cached for exactly `query` expires (None if there is none)."""
+        scope, key = self._scope(sources), normalize_query(query)
+        return next(
+            (e["expires_at"] for e in self._entries if e is not None and e["query"] == key and e["scope"] == scope),
+            None,
+        )
+
+    def store(self, query, sources, results, response):
+        """Caches `response` for `query`. `results` are the per-source results (before dedup) it was built from.
+
+        A report expires with the first of the cached results it was built
+        from, and replaces any earlier report for the same query. Reports built
+        while some source had failed only live for `partial_ttl`; reports with
+        no successful source are not cached.
+        """
+        scope = self._scope(sources)
+        failed = {source for source, r in results.items() if isinstance(r, dict) and "status" in r}
+        if set(results) != set(scope) or failed == set(scope):
+            return
+        key = normalize_query(query)
+        slot = next(
+            (i for i, e in enumerate(self._entries) if e is not None and e["query"] == key and e["scope"] == scope),
+            None,
+        )
+        if slot is None:
+            slot = self._next
+            self._next = (self._next + 1) % len(self._entries)
+        now = time.time()
+        expires_at = min([now + (self.partial_ttl if failed else self.ttl)] + [
+            result_cache.expires_at(source.name, query, source.num_results) or now + source_ttl(source.name)
+            for source in resolve_sources(scope) if source.name not in failed
+        ])
+        self._vectors[slot] = embed_query(query)
+        self._entries[slot] = {
+            "query": key,
+            "scope": scope,
+            "numbers": query_numbers(query),
+            "terms": query_terms(query),
+            "fingerprints": {source: fingerprint(r) for source, r in results.items() if source not in failed},
+            "response": response,
+            "expires_at": expires_at,
+            "stale_until": expires_at + self.stale_ttl,
+        }
+        self.counters["stored_partial" if failed else "stored"] += 1
+
+    def stats(self):
+        return {**self.counters, "entries": sum(entry is not None for entry in self._entries)}
+
+
+# Process-wide report cache
+report_cache = SemanticReportCache()
@@ -0,0 +1,45 @@
+import asyncio
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into one underlying execution.
+
+    The first caller starts the work as its own task; everyone arriving while
+    it is in flight awaits that same task. The task is shielded so a caller
+    that disconnects does not cancel the work for the others.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self._flights = {}
+        self.counters = {"executions": 0, "coalesced": 0}
+
+    async def do(self, key, call):
+        """Returns the result of `call()`, sharing it with concurrent callers using `key`."""
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = {"task": asyncio.ensure_future(call()), "waiters": 0}
+            self._flights[key] = flight
+            self.counters["executions"] += 1
+            flight["task"].add_done_callback(lambda _: self._forget(key, flight))
+        else:
+            self.counters["coalesced"] += 1
+
+        flight["waiters"] += 1
+        try:
+            return await asyncio.shield(flight["task"])
+        finally:
+            flight["waiters"] -= 1
+
+    def _forget(self, key, flight):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    def stats(self):
+        waiters = [flight["waiters"] for flight in self._flights.values()]
+        return {
+            **self.counters,
+            "inflight": len(waiters),
+            "waiters": sum(waiters),
+            "max_waiters": max(waiters, default=0),
+        }
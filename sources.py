@@ -0,0 +1,66 @@
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from tools import fetch_wikipedia, fetch_hackernews, fetch_newsapi, fetch_arxiv, NEWS_API_KEY
+from reddit import reddit_client, REDDIT_CLIENT_ID, REDDIT_CLIENT_SECRET
+from tavily import fetch_tavily, TAVILY_API_KEY
+from youtube import fetch_youtube_videos, YOUTUBE_API_KEY
+
+
+@dataclass(frozen=True)
+class Source:
+    """One research source: how to call it and what it costs.
+
+    `adapter(query, num_results)` raises on failure; it is a coroutine function
+    when `is_async` is true and runs on a worker thread otherwise. `cost` is
+    in upstream quota units per call (0 for free APIs). A source whose API
+    key is not configured is not `enabled` and returns no results without a call.
+    """
+
+    name: str
+    adapter: Callable
+    is_async: bool
+    cost: int = 0
+    num_results: Optional[int] = 5
+    icon: str = "🔎"
+    enabled: bool = True
+
+    def call_args(self, query):
+        return (query,) if self.num_results is None else (query, self.num_results)
+
+
+# ✅ Every source the supervisor can fan out to, in display order
+SOURCES = {
+    source.name: source
+    for source in (
+        Source(
+            "Reddit", reddit_client.search, is_async=True, cost=1, icon="📢",
+            enabled=bool(REDDIT_CLIENT_ID and REDDIT_CLIENT_SECRET),
+        ),
+        Source("Tavily", fetch_tavily, is_async=True, cost=1, num_results=3, icon="🌍", enabled=bool(TAVILY_API_KEY)),
+        Source("YouTube", fetch_youtube_videos, is_async=True, cost=100, icon="📺", enabled=bool(YOUTUBE_API_KEY)),
+        Source("Wikipedia", fetch_wikipedia, is_async=True, num_results=3, icon="📖"),
+        Source("Hacker News", fetch_hackernews, is_async=True, icon="📰"),
+        Source("NewsAPI", fetch_newsapi, is_async=True, cost=1, icon="🗞️", enabled=bool(NEWS_API_KEY)),
+        Source("Arxiv", fetch_arxiv, is_async=True, icon="📄"),
+    )
+}
+
+
+def resolve_sources(names=None):
+    """Returns the requested Source entries (all of them when `names` is empty). Raises ValueError on unknown names."""
+    if not names:
+        return list(SOURCES.values())
+    unknown = [name for name in names if name not in SOURCES]
+    if unknown:
+        raise ValueError(f"Unknown sources: {', '.join(unknown)}. Choose from: {', '.join(SOURCES)}")
+    return [SOURCES[name] for name in SOURCES if name in names]
+
+
+def parse_source_names(value):
+    """Splits a comma-separated `sources=` parameter, matching names case-insensitively."""
+    if not value:
+        return None
+    by_lower = {name.lower(): name for name in SOURCES}
+    names = [part.strip() for part in value.split(",") if part.strip()]
+    return [by_lower.get(name.lower(), name) for name in names]
@@ -1,30 +1,90 @@
 import asyncio
 import os
+import time
 from dotenv import load_dotenv
-from langgraph.prebuilt import create_react_agent
-from langgraph.graph import StateGraph, END
-from langchain_openai import ChatOpenAI
-
-# ✅ Import tools
-from tools import (
-    wikipedia_tool,
-    hackernews_tool,
-    newsapi_tool,
-    arxiv_tool
-)
-from reddit import fetch_reddit_posts
+
+# ✅ Import tools (heavy SDKs and LangChain/LangGraph are imported lazily on first use)
+from reddit import fetch_reddit_posts, reddit_client
 from tavily import search_tavily
-from youtube import youtube_search_tool
+from sources import SOURCES, resolve_sources
+from cache import result_cache, normalize_query
+from resilience import resilient_call, describe_error, CircuitOpenError
+from executors import source_executor, ExecutorSaturated
+from ratelimit import RateLimitExceeded
+from singleflight import SingleFlight
+from llm_gateway import LLMGateway
+from dedup import dedup_results
+from context import pack_results, render_context, get_encoding
+from semantic_cache import report_cache
+from prewarm import query_popularity, PREWARM_LEAD
+from telemetry import tracer, record_source_call, record_stages, traced_lookup
 
 # ✅ Load environment variables
 load_dotenv()
 
-# ✅ Initialize OpenAI model
-model = ChatOpenAI(
-    temperature=0.8,
-    api_key=os.getenv("OPENAI_API_KEY"),
-    model="gpt-4o-mini"
-)
+# ✅ Latency budget for the fan-out, plus per-source deadlines (e.g. SOURCE_DEADLINE_WIKIPEDIA=4)
+SEARCH_BUDGET = float(os.getenv("SEARCH_BUDGET", "12"))
+SOURCE_DEADLINE = float(os.getenv("SOURCE_DEADLINE", "8"))
+
+# ✅ Map-reduce synthesis: a cheap model summarizes each source as it lands, the report model merges the summaries
+SYNTHESIS_MODE = os.getenv("SYNTHESIS_MODE", "map_reduce")
+SUMMARY_MODEL = os.getenv("SUMMARY_MODEL", "gpt-4o-mini")
+SUMMARY_MAX_TOKENS = int(os.getenv("SUMMARY_MAX_TOKENS", "250"))
+SUMMARY_INPUT_TOKENS = int(os.getenv("SUMMARY_INPUT_TOKENS", "2000"))
+# Once every source is in, how long to wait for late summaries before using packed results instead
+SUMMARY_GRACE = float(os.getenv("SUMMARY_GRACE", "0.2"))
+SUMMARY_FALLBACK_TOKENS = int(os.getenv("SUMMARY_FALLBACK_TOKENS", "500"))
+
+# ✅ After a background refresh that cached no report, stale hits wait this long before starting another
+REVALIDATE_BACKOFF = float(os.getenv("REVALIDATE_BACKOFF", "60"))
+
+_model = None
+_summary_model = None
+_agents = None
+_workflow = None
+
+# ✅ Initialize OpenAI model (on first use)
+def get_model():
+    global _model
+    if _model is None:
+        from langchain_openai import ChatOpenAI
+        _model = ChatOpenAI(
+            temperature=0.8,
+            api_key=os.getenv("OPENAI_API_KEY"),
+            model="gpt-4o-mini",
+            stream_usage=True,
+            # LLMGateway retries 429s and adapts its limit; SDK retries would hide them from it
+            max_retries=0
+        )
+    return _model
+
+# ✅ Initialize the per-source summary model (on first use)
+def get_summary_model():
+    global _summary_model
+    if _summary_model is None:
+        from langchain_openai import ChatOpenAI
+        _summary_model = ChatOpenAI(
+            temperature=0,
+            api_key=os.getenv("OPENAI_API_KEY"),
+            model=SUMMARY_MODEL,
+            max_tokens=SUMMARY_MAX_TOKENS,
+            max_retries=0
+        )
+    return _summary_model
+
+# ✅ Every model call goes through the async gateway so it never blocks the event loop
+llm_gateway = LLMGateway(get_model, "report")
+summary_gateway = LLMGateway(get_summary_model, "summary")
+
+async def warm_up():
+    """Builds the chat model and token encoding and opens Reddit in the background once the worker is serving."""
+    try:
+        await asyncio.to_thread(get_model)
+        await asyncio.to_thread(get_summary_model)
+        await asyncio.to_thread(get_encoding)
+        await reddit_client.open()
+    except Exception as e:
+        print(f"⚠️ Warm-up failed, clients will be built on first use: {e}")
 
 # ✅ Async function for Reddit
 async def reddit_search_tool(query: str):
@@ -41,35 +101,152 @@ async def run_tool(tool, query):
     """Runs LangChain Tools & normal functions correctly."""
     return await asyncio.to_thread(tool.invoke, query) if hasattr(tool, "invoke") else await asyncio.to_thread(tool, query)
 
-# ✅ Create LangGraph Agents
-agents = {
-    "Reddit": create_react_agent(model, [reddit_search_tool], name="Reddit Agent", prompt="Fetch trending Reddit posts."),
-    "Tavily": create_react_agent(model, [tavily_search_tool], name="Web Search Agent", prompt="Fetch articles using Tavily."),
-    "YouTube": create_react_agent(model, [youtube_search_tool], name="YouTube Agent", prompt="Fetch trending YouTube videos."),
-    "Wikipedia": create_react_agent(model, [wikipedia_tool], name="Wikipedia Agent", prompt="Fetch Wikipedia summaries."),
-    "Hacker News": create_react_agent(model, [hackernews_tool], name="Hacker News Agent", prompt="Find trending Hacker News."),
-    "NewsAPI": create_react_agent(model, [newsapi_tool], name="News Agent", prompt="Fetch the latest news articles."),
-    "Arxiv": create_react_agent(model, [arxiv_tool], name="Arxiv Research Agent", prompt="Fetch latest AI research papers."),
-}
-
-def combine_results(state):
-    """Combine results into structured response."""
-    query = state["messages"][0].content
-    source_results = {msg.content.split(":")[0]: msg.content.split(":", 1)[1].strip() for msg in state["messages"][1:] if isinstance(msg, dict)}
-    
-    prompt = f"""
+# ✅ Create LangGraph Agents (on first use; run_supervisor_flow does not need them)
+def get_agents():
+    global _agents
+    if _agents is None:
+        from langgraph.prebuilt import create_react_agent
+        from tools import wikipedia_tool, hackernews_tool, newsapi_tool, arxiv_tool
+        from youtube import youtube_search_tool
+
+        model = get_model()
+        _agents = {
+            "Reddit": create_react_agent(model, [reddit_search_tool], name="Reddit Agent", prompt="Fetch trending Reddit posts."),
+            "Tavily": create_react_agent(model, [tavily_search_tool], name="Web Search Agent", prompt="Fetch articles using Tavily."),
+            "YouTube": create_react_agent(model, [youtube_search_tool], name="YouTube Agent", prompt="Fetch trending YouTube videos."),
+            "Wikipedia": create_react_agent(model, [wikipedia_tool], name="Wikipedia Agent", prompt="Fetch Wikipedia summaries."),
+            "Hacker News": create_react_agent(model, [hackernews_tool], name="Hacker News Agent", prompt="Find trending Hacker News."),
+            "NewsAPI": create_react_agent(model, [newsapi_tool], name="News Agent", prompt="Fetch the latest news articles."),
+            "Arxiv": create_react_agent(model, [arxiv_tool], name="Arxiv Research Agent", prompt="Fetch latest AI research papers."),
+        }
+    return _agents
+
+def build_report_prompt(query, findings=""):
+    """Builds the synthesis prompt for the final markdown report from already-packed findings."""
+    return f"""
     Organize the research findings for: "{query}".
     Summarize key points and format as a markdown report:
     - A brief summary
     - Findings categorized by source
     - Markdown formatting for readability
+    - Stories reported by several sources appear once
+
+    Findings:
+{findings}
+    """
+
+def build_summary_prompt(query, source, packed):
+    """Builds the map-step prompt that condenses one source's results."""
+    return f"""
+    Summarize these {source} results for research on: "{query}".
+    Reply with at most 5 short bullet points covering the most relevant findings.
+    Keep titles and URLs for the items you mention. Skip anything off-topic.
+
+    {source} results:
+{packed}
+    """
+
+async def summarize_source(query, source, results):
+    """Map step: condenses one source's results with the summary model.
+
+    Failed or empty sources skip the model call, and a failed summary falls
+    back to the packed results, so the reduce step always gets some text.
+    """
+    packed = (await asyncio.to_thread(pack_results, {source: results}, SUMMARY_INPUT_TOKENS))[source]
+    if is_failure(results) or not results:
+        return packed
+    try:
+        return (await summary_gateway.ainvoke(build_summary_prompt(query, source, packed))).content
+    except Exception as e:
+        print(f"⚠️ {source} summary failed, using packed results: {e}")
+        return packed
+
+class MapStep:
+    """Map step of map-reduce synthesis, fed each source's results as they land.
+
+    Each source is deduplicated against the sources already in, so a story
+    is summarized once. Summaries only pay off while slower sources are
+    still fetching: sources landing within SUMMARY_GRACE of the start are
+    held, and if every source is in by then (e.g. all from the result cache)
+    the map step is skipped. The last source to land is never summarized.
     """
-    structured_response = model.invoke(prompt).content
+
+    def __init__(self, query, total):
+        self.query = query
+        self.total = total
+        self.results = {}
+        self.tasks = {}
+        self._holding = asyncio.get_running_loop().call_later(SUMMARY_GRACE, self._release)
+
+    def _start(self, source):
+        if source not in self.tasks:
+            self.tasks[source] = asyncio.create_task(summarize_source(self.query, source, self.results[source]))
+
+    def _release(self):
+        self._holding = None
+        if len(self.results) < self.total:
+            for source in self.results:
+                self._start(source)
+
+    def add(self, source, results):
+        """Records one landed source, starting its summary if others are still in flight."""
+        self.results[source] = dedup_results({**self.results, source: results})[source]
+        if self._holding is None and len(self.results) < self.total:
+            self._start(source)
+
+    async def summaries(self):
+        """Collects the summaries, or returns None when the map step was skipped.
+
+        Summaries still running SUMMARY_GRACE seconds after the last source
+        landed are cancelled; those sources, like the last one, fall back to
+        their deduplicated results packed to SUMMARY_FALLBACK_TOKENS.
+        """
+        self.close()
+        if not self.tasks:
+            return None
+        await asyncio.wait(self.tasks.values(), timeout=SUMMARY_GRACE)
+        summaries = {}
+        for source, results in self.results.items():
+            task = self.tasks.get(source)
+            if task is not None and task.done() and not task.cancelled():
+                summaries[source] = task.result()
+            else:
+                summaries[source] = pack_results({source: results}, SUMMARY_FALLBACK_TOKENS)[source]
+        return summaries
+
+    def close(self):
+        if self._holding is not None:
+            self._holding.cancel()
+            self._holding = None
+
+    def cancel(self):
+        self.close()
+        for task in self.tasks.values():
+            task.cancel()
+
+async def combine_results(state):
+    """Combine results into structured response."""
+    query = state["messages"][0]["content"]
+    findings = "\n\n".join(message["content"] for message in state["messages"][1:])
+    structured_response = (await llm_gateway.ainvoke(build_report_prompt(query, findings))).content
     state["messages"].append({"role": "assistant", "content": structured_response})
     return state
 
+async def stream_report(query, results, summaries=None):
+    """Streams the synthesized report token by token, merging per-source `summaries` when given."""
+    if summaries is not None:
+        findings = render_context(summaries)
+    else:
+        findings = await asyncio.to_thread(lambda: render_context(pack_results(results)))
+    async for chunk in llm_gateway.astream(build_report_prompt(query, findings)):
+        if chunk.content:
+            yield chunk.content
+
 def create_custom_supervisor():
     """Creates LangGraph-based supervisor workflow."""
+    from langgraph.graph import StateGraph, END
+
+    agents = get_agents()
     workflow = StateGraph()  # ✅ FIXED: Correct initialization
 
     for agent_name, agent in agents.items():
@@ -83,38 +260,277 @@ def create_custom_supervisor():
     workflow.add_edge("combiner", END)
     return workflow
 
-# ✅ Compile Workflow
-workflow = create_custom_supervisor().compile()
-
-async def get_agent_results(query):
-    """Run all agents asynchronously."""
-    tasks = [
-        asyncio.create_task(reddit_search_tool(query)),
-        asyncio.create_task(run_tool(tavily_search_tool, query)),
-        asyncio.create_task(run_tool(youtube_search_tool, query)),
-        asyncio.create_task(run_tool(wikipedia_tool, query)),
-        asyncio.create_task(run_tool(hackernews_tool, query)),
-        asyncio.create_task(run_tool(newsapi_tool, query)),
-        asyncio.create_task(run_tool(arxiv_tool, query))
-    ]
-    return await asyncio.gather(*tasks)
-
-async def run_supervisor_flow(query):
-    """Runs full research process asynchronously."""
-    results = await get_agent_results(query)
-
-    state = {
-        "messages": [
-            {"role": "user", "content": query},
-            {"role": "assistant", "content": f"Reddit Results: {results[0]}"},
-            {"role": "assistant", "content": f"Tavily Results: {results[1]}"},
-            {"role": "assistant", "content": f"YouTube Results: {results[2]}"},
-            {"role": "assistant", "content": f"Wikipedia Results: {results[3]}"},
-            {"role": "assistant", "content": f"Hacker News Results: {results[4]}"},
-            {"role": "assistant", "content": f"NewsAPI Results: {results[5]}"},
-            {"role": "assistant", "content": f"Arxiv Results: {results[6]}"}
-        ]
+# ✅ Compile Workflow (on first use)
+def get_workflow():
+    global _workflow
+    if _workflow is None:
+        _workflow = create_custom_supervisor().compile()
+    return _workflow
+
+def __getattr__(name):
+    """Keeps `supervisor.model`, `.agents` and `.workflow` importable while building them lazily."""
+    if name == "model":
+        return get_model()
+    if name == "agents":
+        return get_agents()
+    if name == "workflow":
+        return get_workflow()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# ✅ Coalesces identical source calls that are in flight at the same time
+source_flights = SingleFlight("source")
+
+async def cached_call(source, query, num_results, call, min_ttl=0):
+    """Serves `source` results from the result cache, calling `call()` only on a miss.
+
+    Cached results expiring within `min_ttl` seconds are fetched again.
+    """
+    async def load():
+        results = await traced_lookup("result", result_cache.get(source, query, num_results, min_ttl), source=source)
+        if results is not None:
+            return results
+
+        try:
+            results = await resilient_call(source, call)
+        except (RateLimitExceeded, ExecutorSaturated):
+            # Out of budget or shed by a full source pool: fall back to the last results we have, however old
+            results = await result_cache.get_stale(source, query, num_results)
+            if results is None:
+                raise
+            return results
+
+        await result_cache.set(source, query, num_results, results)
+        return results
+
+    key = result_cache.make_key(source, query, num_results)
+    # A refresh must not join a plain lookup that may hand back the results it is meant to replace
+    return await source_flights.do(f"{key}|refresh" if min_ttl else key, load)
+
+def source_deadline(source):
+    return float(os.getenv("SOURCE_DEADLINE_" + source.upper().replace(" ", "_"), SOURCE_DEADLINE))
+
+def is_failure(results):
+    """True for the status markers that stand in for a source that timed out, errored or is circuit-broken."""
+    return isinstance(results, dict) and "status" in results
+
+async def guarded_call(source, call, budget):
+    """Awaits one source within min(its deadline, the request budget), returning a status marker instead of raising."""
+    timeout = min(source_deadline(source), budget)
+    with tracer.start_as_current_span("source", attributes={"source": source, "deadline": timeout}) as span:
+        started = time.perf_counter()
+        try:
+            results = await asyncio.wait_for(call(), timeout)
+        except asyncio.TimeoutError:
+            print(f"⏱️ {source} timed out after {timeout}s")
+            results = {"status": "timeout", "deadline": timeout}
+        except CircuitOpenError:
+            results = {"status": "unavailable"}
+        except ExecutorSaturated as e:
+            print(f"🚧 {e}, shedding {source}")
+            results = {"status": "shed"}
+        except RateLimitExceeded as e:
+            print(f"🚦 {e}")
+            results = {"status": "rate_limited", "reason": e.reason}
+        except Exception as e:
+            # Never str(e): HTTP errors quote the request URL, API key included
+            error = describe_error(e)
+            print(f"❌ {source} failed: {error}")
+            span.set_attribute("error.type", type(e).__name__)
+            results = {"status": "error", "error": error}
+        record_source_call(span, source, results["status"] if is_failure(results) else "ok", time.perf_counter() - started)
+        return results
+
+def source_calls(query, sources=None, min_ttl=0):
+    """Maps each selected source name to a zero-argument coroutine factory for `query`."""
+    def make_call(source):
+        async def skip():
+            # No API key configured: nothing to fetch, cache, rate-limit or count against the breaker
+            return []
+
+        if not source.enabled:
+            return skip
+
+        async def invoke():
+            if source.is_async:
+                return await source.adapter(*source.call_args(query))
+            # Blocking adapters get their own bounded pool so a slow one cannot starve the others
+            return await source_executor(source.name).run(source.adapter, *source.call_args(query))
+
+        return lambda: cached_call(source.name, query, source.num_results, invoke, min_ttl)
+
+    return {source.name: make_call(source) for source in resolve_sources(sources)}
+
+def guarded_calls(query, budget=None, sources=None, limits=None, min_ttl=0):
+    """Maps each selected source name to a zero-argument coroutine factory that returns results or a status marker.
+
+    With `limits` (a batch.BatchLimits), each call waits for its batch slots
+    before its deadline starts.
+    """
+    budget = budget or SEARCH_BUDGET
+    guarded = {
+        source: (lambda source=source, call=call: guarded_call(source, call, budget))
+        for source, call in source_calls(query, sources, min_ttl).items()
     }
+    if limits is None:
+        return guarded
+    return {
+        source: (lambda source=source, call=call: limits.run(source, call))
+        for source, call in guarded.items()
+    }
+
+async def get_agent_results(query, budget=None, sources=None, limits=None, min_ttl=0):
+    """Run the selected agents asynchronously, bounded by `budget` seconds (SEARCH_BUDGET by default).
+
+    Returns results keyed by source name.
+    """
+    calls = guarded_calls(query, budget, sources, limits, min_ttl)
+    results = await asyncio.gather(*(call() for call in calls.values()))
+    return dict(zip(calls, results))
+
+async def iter_agent_results(query, budget=None, sources=None, limits=None, min_ttl=0):
+    """Yields (source, results) pairs in completion order, cancelling leftovers if the consumer stops early."""
+    pending = {
+        asyncio.create_task(call()): source
+        for source, call in guarded_calls(query, budget, sources, limits, min_ttl).items()
+    }
+    try:
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield pending.pop(task), task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+
+async def map_sources(query, budget=None, sources=None, limits=None, min_ttl=0):
+    """Fans out to the sources, summarizing each one while slower ones are still fetching (see MapStep).
+
+    Returns (results, summaries) keyed by source name in registry order;
+    summaries is None when the map step was skipped.
+    """
+    order = [source.name for source in resolve_sources(sources)]
+    results, mapper = {}, MapStep(query, len(order))
+    try:
+        async for source, source_results in iter_agent_results(query, budget, sources, limits, min_ttl):
+            results[source] = source_results
+            mapper.add(source, source_results)
+        summaries = await mapper.summaries()
+    finally:
+        mapper.cancel()
+
+    if summaries is not None:
+        summaries = {s: summaries[s] for s in order}
+    return {s: results[s] for s in order}, summaries
+
+def build_messages(query, results, summaries=None):
+    """Builds the supervisor's message list from results keyed by source name.
+
+    Uses the per-source `summaries` when given (they already cover the deduplicated results),
+    otherwise the results packed to CONTEXT_TOKEN_BUDGET.
+    """
+    findings = summaries if summaries is not None else pack_results(results)
+    return [{"role": "user", "content": query}] + [
+        {"role": "assistant", "content": f"{source} Results:\n{text}"}
+        for source, text in findings.items()
+    ]
+
+async def research(query, budget=None, sources=None, limits=None, min_ttl=0):
+    """Fetches, dedups and synthesizes a fresh report for `query` and caches it.
+
+    Source results cached for less than `min_ttl` more seconds are fetched
+    again. Returns (response, timings) with "fetch" and "synthesis" wall
+    times in seconds.
+    """
+    started = time.perf_counter()
+    with tracer.start_as_current_span("fetch", attributes={"synthesis.mode": SYNTHESIS_MODE}):
+        if SYNTHESIS_MODE == "map_reduce":
+            # ✅ Summaries run while slower sources are still fetching; the report call only merges them
+            fetched, summaries = await map_sources(query, budget, sources, limits, min_ttl)
+        else:
+            fetched, summaries = await get_agent_results(query, budget, sources, limits, min_ttl), None
+    timings = {"fetch": time.perf_counter() - started}
+    # ✅ Merge the same story found by several sources before it reaches the model
+    results = dedup_results(fetched)
+
+    synthesis_started = time.perf_counter()
+    with tracer.start_as_current_span("synthesis"):
+        state = {"messages": await asyncio.to_thread(build_messages, query, results, summaries)}
+        final_state = await combine_results(state)
+    response = {"final_response": final_state["messages"][-1]["content"], "raw_results": results}
+    report_cache.store(query, sources, fetched, response)
+    timings["synthesis"] = time.perf_counter() - synthesis_started
+    return response, timings
+
+# ✅ Background refreshes in flight, one per (query, sources), and when failed ones may run again
+_refreshes = {}
+_refresh_retry_at = {}
+
+def _refresh_key(query, sources):
+    return normalize_query(query), tuple(sorted(sources or SOURCES))
+
+def _refresh_done(key, query, sources, task):
+    _refreshes.pop(key, None)
+    if not task.cancelled() and task.exception() is not None:
+        print(f"⚠️ Background refresh of '{query}' failed: {task.exception()}")
+    now = time.time()
+    if (report_cache.expires_at(query, sources) or 0) > now:
+        _refresh_retry_at.pop(key, None)
+        return
+    for stale_key in [k for k, retry_at in _refresh_retry_at.items() if retry_at <= now]:
+        del _refresh_retry_at[stale_key]
+    _refresh_retry_at[key] = now + REVALIDATE_BACKOFF
+
+def revalidate(query, sources=None):
+    """Re-researches `query` in the background, joining the refresh already running for it if there is one.
+
+    Source results about to expire (within PREWARM_LEAD) are fetched again too,
+    so the new report does not go stale as soon as it is cached.
+    """
+    key = _refresh_key(query, sources)
+    task = _refreshes.get(key)
+    if task is None:
+        task = asyncio.create_task(research(query, None, sources, min_ttl=PREWARM_LEAD))
+        _refreshes[key] = task
+        task.add_done_callback(lambda task: _refresh_done(key, query, sources, task))
+    return task
+
+async def lookup_report(query, sources=None):
+    """Returns a cached report for `query`, counting the request toward its topic's popularity.
+
+    Falls back to an outdated report marked "stale": True while a background
+    run replaces it (unless a refresh for it just failed). None on a miss.
+    """
+    query_popularity.record(query, sources)
+    # ✅ A report for the same or a paraphrased query, built from unchanged results, skips the model entirely
+    cached = await traced_lookup("report", report_cache.lookup(query, sources))
+    if cached is not None:
+        return cached
+
+    # ✅ Stale-while-revalidate: an outdated report answers now while a background run replaces it
+    stale = report_cache.lookup_stale(query, sources)
+    if stale is None:
+        return None
+    response, cached_query = stale
+    if _refresh_retry_at.get(_refresh_key(cached_query, sources), 0) <= time.time():
+        revalidate(cached_query, sources)
+    return {**response, "stale": True}
+
+async def run_supervisor_flow(query, budget=None, sources=None, limits=None):
+    """Runs full research process asynchronously. `limits` shares concurrency caps across a batch of queries.
+
+    The response carries per-stage wall times in seconds under "timings", and
+    "stale": True when it is an outdated report served while a fresh one is researched.
+    """
+    started = time.perf_counter()
+    cached = await lookup_report(query, sources)
+    timings = {"report_cache": time.perf_counter() - started}
+    if cached is not None:
+        timings["total"] = timings["report_cache"]
+        record_stages(timings)
+        return {**cached, "timings": timings}
 
-    final_state = combine_results(state)
-    return {"final_response": final_state["messages"][-1]["content"], "raw_results": dict(zip(agents.keys(), results))}
+    response, research_timings = await research(query, budget, sources, limits)
+    timings.update(research_timings)
+    timings["total"] = time.perf_counter() - started
+    record_stages(timings)
+    return {**response, "timings": timings}
@@ -12,9 +12,12 @@ from tools import (
     newsapi_tool,
     arxiv_tool
 )
-from reddit import fetch_reddit_posts
+from reddit import fetch_reddit_posts, reddit_client
 from tavily import search_tavily
 from youtube import youtube_search_tool
+from sources import SOURCES
+from supervisor import get_agent_results, build_messages
+from http_client import close_http_client
 
 # ✅ Load environment variables
 load_dotenv()
@@ -117,51 +120,22 @@ async def main():
     query = input("🔍 Enter a topic to search: ").strip()
     print(f"\n🔍 Searching for '{query}'...\n")
 
-    # Run all agents concurrently
-    tasks = [
-        asyncio.create_task(reddit_search_tool(query)),
-        asyncio.create_task(run_tool(tavily_search_tool, query)),
-        asyncio.create_task(run_tool(youtube_search_tool, query)),
-        asyncio.create_task(run_tool(wikipedia_tool, query)),
-        asyncio.create_task(run_tool(hackernews_tool, query)),
-        asyncio.create_task(run_tool(newsapi_tool, query)),
-        asyncio.create_task(run_tool(arxiv_tool, query))
-    ]
-
-    # Collect results
-    results = await asyncio.gather(*tasks)
-    (
-        reddit_results, tavily_results, youtube_results, 
-        wikipedia_results, hackernews_results, 
-        newsapi_results, arxiv_results
-    ) = results
+    # Run all agents concurrently (results are keyed by source name)
+    results = await get_agent_results(query)
 
     # Print Raw Results
-    print("\n🟥 Raw Reddit Results:\n", reddit_results)
-    print("\n🌍 Raw Tavily Results:\n", tavily_results)
-    print("\n📺 Raw YouTube Results:\n", youtube_results)
-    print("\n📖 Raw Wikipedia Results:\n", wikipedia_results)
-    print("\n📰 Raw Hacker News Results:\n", hackernews_results)
-    print("\n🗞️ Raw NewsAPI Results:\n", newsapi_results)
-    print("\n📄 Raw Arxiv Results:\n", arxiv_results)
+    for source, source_results in results.items():
+        print(f"\n{SOURCES[source].icon} Raw {source} Results:\n", source_results)
 
     print("\n🔄 Passing results to Supervisor AI...\n")
 
     # Invoke Supervisor AI
-    result = app.invoke({
-        "messages": [
-            {"role": "user", "content": query},
-            {"role": "assistant", "content": f"Reddit Results: {reddit_results}"},
-            {"role": "assistant", "content": f"Tavily Results: {tavily_results}"},
-            {"role": "assistant", "content": f"YouTube Results: {youtube_results}"},
-            {"role": "assistant", "content": f"Wikipedia Results: {wikipedia_results}"},
-            {"role": "assistant", "content": f"Hacker News Results: {hackernews_results}"},
-            {"role": "assistant", "content": f"NewsAPI Results: {newsapi_results}"},
-            {"role": "assistant", "content": f"Arxiv Results: {arxiv_results}"}
-        ]
-    })
+    result = await app.ainvoke({"messages": build_messages(query, results)})
 
     print("\n🔹 Final Structured Response:\n", result)
 
+    await reddit_client.close()
+    await close_http_client()
+
 if __name__ == "__main__":
     asyncio.run(main())
@@ -16,6 +16,7 @@ from tools import (
 from reddit import fetch_reddit_posts
 from tavily import search_tavily  # ⬅️ This is a sync function, don't use `await`
 from youtube import youtube_search_tool
+from context import pack_results
 
 # ✅ Load environment variables
 load_dotenv()
@@ -135,17 +136,22 @@ async def main():
 
     print("\n🔄 Passing results to Supervisor AI...\n")
 
+    # ✅ Pack results into the token budget instead of pasting them whole
+    packed = pack_results({
+        "Reddit": reddit_results,
+        "Tavily": tavily_results,
+        "YouTube": youtube_results,
+        "Wikipedia": wikipedia_results,
+        "Hacker News": hackernews_results,
+        "NewsAPI": newsapi_results,
+        "Arxiv": arxiv_results,
+    })
+
     # Invoke Supervisor AI
     result = app.invoke({
-        "messages": [
-            {"role": "user", "content": query},
-            {"role": "assistant", "content": f"Reddit Results: {reddit_results}"},
-            {"role": "assistant", "content": f"Tavily Results: {tavily_results}"},
-            {"role": "assistant", "content": f"YouTube Results: {youtube_results}"},
-            {"role": "assistant", "content": f"Wikipedia Results: {wikipedia_results}"},
-            {"role": "assistant", "content": f"Hacker News Results: {hackernews_results}"},
-            {"role": "assistant", "content": f"NewsAPI Results: {newsapi_results}"},
-            {"role": "assistant", "content": f"Arxiv Results: {arxiv_results}"}
+        "messages": [{"role": "user", "content": query}] + [
+            {"role": "assistant", "content": f"{source} Results:\n{text}"}
+            for source, text in packed.items()
         ]
     })
 
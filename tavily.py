@@ -1,14 +1,21 @@
 import os
 from dotenv import load_dotenv
-from langchain_community.tools import TavilySearchResults
+
+from http_client import post
 
 # Load environment variables
 load_dotenv()
+TAVILY_API_KEY = os.getenv("TAVILY_API_KEY")
+TAVILY_API_URL = os.getenv("TAVILY_API_URL", "https://api.tavily.com")
+
+def _parse_tavily(results):
+    return [{"title": res["title"], "url": res["url"]} for res in results]
 
 # ✅ Initialize Tavily Search Tool
 def search_tavily(query: str, num_results: int = 3):
     """Uses Tavily API to perform a web search and return relevant results."""
     try:
+        from langchain_community.tools import TavilySearchResults
         tavily_tool = TavilySearchResults(max_results=num_results)
         results = tavily_tool.invoke(query)
 
@@ -16,12 +23,29 @@ def search_tavily(query: str, num_results: int = 3):
             print("⚠️ No relevant search results found from Tavily.")
             return []
 
-        return [{"title": res["title"], "url": res["url"]} for res in results]
+        if isinstance(results, str):
+            # The LangChain tool returns its error message as a string instead of raising
+            raise RuntimeError(results)
+
+        return _parse_tavily(results)
 
     except Exception as e:
         print(f"❌ Error with Tavily API: {e}")
         return []
 
+async def fetch_tavily(query: str, num_results: int = 3):
+    """Async Tavily search against the REST endpoint on the shared pooled client. Raises on failure.
+
+    Basic depth costs one API credit (advanced costs two) and still returns the titles and URLs we keep.
+    """
+    response = await post(f"{TAVILY_API_URL}/search", json={
+        "api_key": TAVILY_API_KEY,
+        "query": query,
+        "max_results": num_results,
+        "search_depth": "basic",
+    })
+    return _parse_tavily(response.json().get("results", []))
+
 # ✅ Run as standalone tool for testing
 if __name__ == "__main__":
     query = input("🔍 Enter a topic to search: ").strip()
@@ -0,0 +1,72 @@
+"""Tracing and Prometheus metrics shared by the backend and the pipeline.
+
+Spans use the OpenTelemetry API only, so they are no-ops until an SDK is
+configured; the usual way is to run the backend under the auto-configuring
+launcher with an exporter installed, e.g.
+    opentelemetry-instrument --traces_exporter otlp uvicorn backend:app
+
+Metrics live in the process-wide prometheus_client registry and are served
+by backend's /metrics. Each uvicorn worker has its own registry.
+"""
+from opentelemetry import trace
+from opentelemetry.trace import Status, StatusCode
+from prometheus_client import Counter, Gauge, Histogram
+
+tracer = trace.get_tracer("research-agent")
+
+# ✅ Buckets span cache hits (milliseconds) up to the fan-out budget and a slow report
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2, 4, 8, 12, 20, 30, 60)
+LAG_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1)
+
+SOURCE_LATENCY = Histogram(
+    "source_call_seconds", "Source call wall time, including cache and deadline", ["source", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+SOURCE_FAILURES = Counter(
+    "source_failures_total", "Source calls that returned a status marker (timeout, error, ...)", ["source", "status"]
+)
+STAGE_LATENCY = Histogram(
+    "stage_seconds", "Wall time of each research stage (the Server-Timing stages)", ["stage"], buckets=LATENCY_BUCKETS
+)
+CACHE_LOOKUPS = Counter("cache_lookups_total", "Cache lookups by cache and result", ["cache", "result"])
+LLM_LATENCY = Histogram("llm_call_seconds", "Model call wall time, excluding gateway queueing", ["gateway"],
+                        buckets=LATENCY_BUCKETS)
+LLM_CALLS = Counter("llm_calls_total", "Model calls by outcome", ["gateway", "outcome"])
+LLM_TOKENS = Counter("llm_tokens_total", "Model tokens used", ["gateway", "kind"])
+LLM_SLOTS = Gauge("llm_slots", "Gateway concurrency: calls in flight and the current adaptive limit", ["gateway", "state"])
+LOOP_LAG = Histogram("event_loop_lag_seconds", "How late a short sleep on the event loop wakes up", buckets=LAG_BUCKETS)
+THREAD_POOL_QUEUE = Gauge("thread_pool_queue_depth", "Work items waiting for a thread", ["pool"])
+THREAD_POOL_THREADS = Gauge("thread_pool_threads", "Threads started by the pool", ["pool"])
+EXECUTOR_WAIT = Histogram("thread_pool_wait_seconds", "Time a source call waited for a thread", ["pool"],
+                          buckets=LATENCY_BUCKETS)
+EXECUTOR_SHED = Counter("thread_pool_shed_total", "Source calls rejected because the pool's queue was full", ["pool"])
+
+
+def watch_executor(name, executor):
+    """Reports a ThreadPoolExecutor's backlog and thread count under `pool=name`, read at scrape time."""
+    THREAD_POOL_QUEUE.labels(name).set_function(lambda: executor._work_queue.qsize())
+    THREAD_POOL_THREADS.labels(name).set_function(lambda: len(executor._threads))
+
+
+def record_source_call(span, source, outcome, seconds):
+    """Records one guarded source call on its span and in the source metrics."""
+    span.set_attribute("outcome", outcome)
+    SOURCE_LATENCY.labels(source, outcome).observe(seconds)
+    if outcome != "ok":
+        span.set_status(Status(StatusCode.ERROR, outcome))
+        SOURCE_FAILURES.labels(source, outcome).inc()
+
+
+def record_stages(timings):
+    for stage, seconds in timings.items():
+        STAGE_LATENCY.labels(stage).observe(seconds)
+
+
+async def traced_lookup(cache, lookup, **attributes):
+    """Awaits one cache lookup (a coroutine returning None on a miss) in its own span, counting hits and misses."""
+    with tracer.start_as_current_span(f"cache.{cache}", attributes=attributes) as span:
+        found = await lookup
+        result = "miss" if found is None else "hit"
+        span.set_attribute("cache.result", result)
+        CACHE_LOOKUPS.labels(cache, result).inc()
+        return found
@@ -0,0 +1,12 @@
+import os
+import sys
+import tempfile
+
+# The modules live flat at the repo root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Keep the SQLite stores the modules open on first use out of the working tree
+_workdir = tempfile.mkdtemp(prefix="research-tests-")
+for name, filename in (("RESULT_CACHE_PATH", "result_cache.sqlite3"), ("RATE_LIMIT_PATH", "rate_limits.sqlite3"),
+                       ("JOB_STORE_PATH", "jobs.sqlite3")):
+    os.environ.setdefault(name, os.path.join(_workdir, filename))
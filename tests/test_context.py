@@ -0,0 +1,28 @@
+import sys
+import types
+
+import context
+
+
+def test_encoding_load_is_retried_after_the_backoff(monkeypatch):
+    calls = []
+
+    def encoding_for_model(model):
+        calls.append(model)
+        if len(calls) == 1:
+            raise ConnectionError("offline")
+        return "encoding"
+
+    monkeypatch.setitem(sys.modules, "tiktoken", types.SimpleNamespace(encoding_for_model=encoding_for_model))
+    monkeypatch.setattr(context, "_encoding", None)
+    monkeypatch.setattr(context, "_encoding_retry_at", 0)
+    now = [1000.0]
+    monkeypatch.setattr(context.time, "monotonic", lambda: now[0])
+
+    assert context.get_encoding() is None
+    assert context.get_encoding() is None
+    assert len(calls) == 1
+
+    now[0] += context.ENCODING_RETRY_BACKOFF
+    assert context.get_encoding() == "encoding"
+    assert len(calls) == 2
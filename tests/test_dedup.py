@@ -0,0 +1,54 @@
+import pytest
+
+from dedup import dedup_results
+
+
+def item(title, url):
+    return {"title": title, "url": url}
+
+
+@pytest.mark.parametrize("first, second", [
+    ("Apple stock rises after earnings", "Apple stock falls after earnings"),
+    ("AI trends 2025: what to expect", "AI trends 2025: what to avoid"),
+    ("How to install Python on Windows 11", "How to uninstall Python on Windows 11"),
+    ("Rust 1.80 released", "Rust 1.81 released"),
+    ("Intro to AI agents, part 1", "Intro to AI agents, part 2"),
+    ("Quantum error correction explained", "Quantum error correction debunked"),
+])
+def test_near_miss_titles_stay_separate(first, second):
+    results = {
+        "Hacker News": [item(first, "https://news.example.com/a")],
+        "NewsAPI": [item(second, "https://press.example.com/b")],
+    }
+    assert dedup_results(results) == results
+
+
+@pytest.mark.parametrize("first, second", [
+    ("OpenAI releases GPT-5 model", "OpenAI Releases GPT-5 Model!"),
+    ("Rust 1.80 released with new features", "Rust 1.80 Released With New Features | Hacker News"),
+    ("Why we moved from Python to Go", "Why We Moved From Python to Go (2024)"),
+])
+def test_retitled_copies_merge(first, second):
+    results = {
+        "Hacker News": [item(first, "https://news.example.com/a")],
+        "NewsAPI": [item(second, "https://press.example.com/b")],
+    }
+    deduped = dedup_results(results)
+    assert deduped["NewsAPI"] == []
+    assert deduped["Hacker News"][0]["sources"] == ["Hacker News", "NewsAPI"]
+    assert deduped["Hacker News"][0]["urls"] == ["https://news.example.com/a", "https://press.example.com/b"]
+
+
+def test_same_page_merges_on_canonical_url():
+    results = {
+        "Reddit": [item("Great thread", "https://old.reddit.com/r/python/comments/abc123/great_thread/")],
+        "Tavily": [item("Something else entirely", "https://www.reddit.com/comments/abc123?utm_source=x")],
+    }
+    deduped = dedup_results(results)
+    assert deduped["Tavily"] == []
+    assert deduped["Reddit"][0]["sources"] == ["Reddit", "Tavily"]
+
+
+def test_failure_markers_and_text_pass_through():
+    results = {"Wikipedia": "Page: Rust\nSummary: ...", "NewsAPI": {"status": "timeout"}}
+    assert dedup_results(results) == results
@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+
+from semantic_cache import SemanticReportCache, is_typo
+from sources import SOURCES
+
+
+def cache_with(query):
+    cache = SemanticReportCache(size=8)
+    cache.store(query, None, {name: [] for name in SOURCES}, {"final_response": query, "raw_results": {}})
+    return cache
+
+
+def matched(cached, query):
+    hit = cache_with(cached).lookup_stale(query)
+    return hit is not None
+
+
+@pytest.mark.parametrize("cached, query", [
+    ("how to install python on windows 11", "how to uninstall python on windows 11"),
+    ("encrypt files on linux", "decrypt files on linux"),
+    ("increase docker memory limit", "decrease docker memory limit"),
+    ("enable secure boot", "disable secure boot"),
+    ("python logging configuration", "python logging deconfiguration"),
+    ("rust async runtime", "rust sync runtime"),
+    ("supervised learning", "unsupervised learning"),
+    ("how to install python on windows 11", "how not to install python on windows 11"),
+    ("ai trends 2025", "ai trends 2024"),
+])
+def test_opposite_queries_do_not_share_a_report(cached, query):
+    assert not matched(cached, query)
+
+
+@pytest.mark.parametrize("cached, query", [
+    ("AI trends 2025", "2025 AI trends"),
+    ("latest ai agents", "ai agents"),
+    ("vector database comparison", "vector databases comparison"),
+    ("kubernetes autoscaling best practices", "kubernets autoscaling best practices"),
+    ("how to install python on windows 11", "how to instal python on windows 11"),
+])
+def test_paraphrases_share_a_report(cached, query):
+    assert matched(cached, query)
+
+
+@pytest.mark.parametrize("a, b, expected", [
+    ("kubernets", "kubernetes", True),
+    ("recieve", "receive", True),
+    ("optimization", "optimisation", True),
+    ("install", "uninstall", False),
+    ("encrypt", "decrypt", False),
+    ("async", "sync", False),
+])
+def test_is_typo(a, b, expected):
+    assert is_typo(a, b) is expected
+
+
+def test_report_built_from_empty_results_stays_valid():
+    # Wikipedia returns "" when nothing matches; like [], it is never cached, so the report must still hit
+    cache = SemanticReportCache(size=8)
+    results = {name: [] for name in SOURCES}
+    results["Wikipedia"] = ""
+    cache.store("rust lang", None, results, {"final_response": "report", "raw_results": results})
+    assert asyncio.run(cache.lookup("rust lang")) is not None
+    assert cache.counters["invalidated"] == 0
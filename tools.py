@@ -1,102 +1,270 @@
+import asyncio
 import os
-import requests
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
+import httpx
 from dotenv import load_dotenv
-from langchain_community.utilities.wikipedia import WikipediaAPIWrapper
-from langchain_core.tools import Tool
+
+from http_client import fetch, stream
+from arxiv_parser import ArxivFeedParser, parse_arxiv_feed
+from telemetry import CACHE_LOOKUPS
+from resilience import describe_error
 
 # ✅ Load environment variables
 load_dotenv()
 NEWS_API_KEY = os.getenv("NEWS_API_KEY")
 
+# ✅ Upstream endpoints (override to point at local stand-ins, e.g. benchmarks/stub_upstreams.py)
+HACKERNEWS_URL = os.getenv("HACKERNEWS_URL", "https://hn.algolia.com/api/v1/search")
+NEWSAPI_URL = os.getenv("NEWSAPI_URL", "https://newsapi.org/v2/everything")
+ARXIV_URL = os.getenv("ARXIV_URL", "http://export.arxiv.org/api/query")
+WIKIPEDIA_API_URL = os.getenv("WIKIPEDIA_API_URL", "https://en.wikipedia.org/w/api.php")
+
+# ✅ Wikipedia: lead sections only by default, each capped, with page text kept per revision
+WIKIPEDIA_SUMMARY_ONLY = os.getenv("WIKIPEDIA_SUMMARY_ONLY", "true").lower() == "true"
+WIKIPEDIA_PAGE_CHARS = int(os.getenv("WIKIPEDIA_PAGE_CHARS", "1200"))
+WIKIPEDIA_PAGE_CACHE_SIZE = int(os.getenv("WIKIPEDIA_PAGE_CACHE_SIZE", "1024"))
+
 # ✅ Wikipedia Search Tool
 def search_wikipedia(query: str):
+    from langchain_community.utilities.wikipedia import WikipediaAPIWrapper
     wiki = WikipediaAPIWrapper()
+    # The wikipedia package only exposes its endpoint as a module global, reset by set_lang() in the wrapper
+    wiki.wiki_client.wikipedia.API_URL = WIKIPEDIA_API_URL
     return wiki.run(query)
 
-wikipedia_tool = Tool(
-    name="Wikipedia Search",
-    description="Fetch structured summaries from Wikipedia for a given topic.",
-    func=search_wikipedia
-)
+class PageCache:
+    """In-process LRU of Wikipedia page text keyed by (title, revision ID, summary only).
+
+    A page is only downloaded again once it has been edited, since an edit
+    changes its revision ID.
+    """
+
+    def __init__(self, max_entries=WIKIPEDIA_PAGE_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._pages = OrderedDict()
+        self.counters = {"hits": 0, "misses": 0}
+
+    def get(self, key):
+        text = self._pages.get(key)
+        if text is None:
+            self.counters["misses"] += 1
+            CACHE_LOOKUPS.labels("wikipedia_page", "miss").inc()
+            return None
+        self.counters["hits"] += 1
+        CACHE_LOOKUPS.labels("wikipedia_page", "hit").inc()
+        self._pages.move_to_end(key)
+        return text
+
+    def set(self, key, text):
+        self._pages[key] = text
+        self._pages.move_to_end(key)
+        while len(self._pages) > self.max_entries:
+            self._pages.popitem(last=False)
+
+    def stats(self):
+        return {**self.counters, "entries": len(self._pages)}
+
+# Process-wide page cache shared by every request
+wikipedia_pages = PageCache()
+
+def _wikipedia_params(**params):
+    return {"action": "query", "format": "json", "formatversion": 2, **params}
+
+def _cap_text(text, limit):
+    """Cuts `text` to at most `limit` characters, at the last sentence end when there is one."""
+    if len(text) <= limit:
+        return text
+    cut = text[:limit]
+    end = cut.rfind(". ")
+    return cut[:end + 1] if end > 0 else cut.rstrip() + "…"
+
+def _format_pages(pages):
+    """Formats (title, text) pairs the way WikipediaAPIWrapper does, which the rest of the pipeline expects."""
+    return "\n\n".join(f"Page: {title}\nSummary: {text}" for title, text in pages if text)
+
+async def _fetch_page_text(page, summary_only):
+    key = (page["title"], page.get("lastrevid"), summary_only)
+    text = wikipedia_pages.get(key)
+    if text is None:
+        params = _wikipedia_params(prop="extracts", explaintext=1, pageids=page["pageid"])
+        if summary_only:
+            params["exintro"] = 1
+        response = await fetch(WIKIPEDIA_API_URL, params=params)
+        pages = response.json().get("query", {}).get("pages", [])
+        text = pages[0].get("extract", "") if pages else ""
+        wikipedia_pages.set(key, text)
+    return text
+
+async def fetch_wikipedia(query: str, num_results=3, summary_only=WIKIPEDIA_SUMMARY_ONLY):
+    """Async Wikipedia search on the shared pooled client. Raises on failure.
+
+    One search call returns the top titles with their current revision IDs;
+    pages not already cached at that revision are then fetched concurrently.
+    """
+    response = await fetch(WIKIPEDIA_API_URL, params=_wikipedia_params(
+        generator="search", gsrsearch=query, gsrlimit=num_results, gsrnamespace=0, prop="info",
+    ))
+    pages = sorted(response.json().get("query", {}).get("pages", []), key=lambda page: page.get("index", 0))
+    texts = await asyncio.gather(*(_fetch_page_text(page, summary_only) for page in pages))
+    return _format_pages(
+        (page["title"], _cap_text(text, WIKIPEDIA_PAGE_CHARS)) for page, text in zip(pages, texts)
+    )
+
+async def asearch_wikipedia(query: str, num_results=3):
+    """Async Wikipedia search on the shared pooled client."""
+    try:
+        return await fetch_wikipedia(query, num_results)
+
+    except (httpx.HTTPError, KeyError) as e:
+        print(f"❌ Error fetching Wikipedia: {e}")
+        return ""
 
 # ✅ Hacker News Search Tool
-def search_hackernews(query: str, num_results=5):
-    url = f"https://hn.algolia.com/api/v1/search?query={query}&hitsPerPage={num_results}"
+def _parse_hackernews(data):
+    return [
+        {
+            "title": item.get("title", "No Title Available"),
+            "url": item.get("url", "#")  # If URL is missing, return "#"
+        }
+        for item in data.get("hits", [])  # Ensure "hits" exist before iterating
+    ]
 
+def search_hackernews(query: str, num_results=5):
+    import requests
     try:
-        response = requests.get(url)
+        response = requests.get(HACKERNEWS_URL, params={"query": query, "hitsPerPage": num_results})
         response.raise_for_status()
-        data = response.json()
-
-        return [
-            {
-                "title": item.get("title", "No Title Available"),
-                "url": item.get("url", "#")  # If URL is missing, return "#"
-            }
-            for item in data.get("hits", [])  # Ensure "hits" exist before iterating
-        ]
+        return _parse_hackernews(response.json())
 
     except requests.RequestException as e:
         print(f"❌ Error fetching Hacker News: {e}")
         return []
 
-hackernews_tool = Tool(
-    name="Hacker News Search",
-    description="Find trending discussions from Hacker News related to a topic.",
-    func=search_hackernews
-)
+async def fetch_hackernews(query: str, num_results=5):
+    """Async Hacker News search on the shared pooled client. Raises on failure."""
+    response = await fetch(HACKERNEWS_URL, params={"query": query, "hitsPerPage": num_results})
+    return _parse_hackernews(response.json())
+
+async def asearch_hackernews(query: str, num_results=5):
+    """Async Hacker News search on the shared pooled client."""
+    try:
+        return await fetch_hackernews(query, num_results)
+
+    except httpx.HTTPError as e:
+        print(f"❌ Error fetching Hacker News: {e}")
+        return []
+
 
 # ✅ NewsAPI Search Tool
+def _parse_newsapi(data):
+    return [
+        {"title": article["title"], "url": article["url"]}
+        for article in data.get("articles", [])  # Ensure "articles" exist
+    ]
+
 def search_newsapi(query: str, num_results=5):
     if not NEWS_API_KEY:
         print("❌ Error: NewsAPI key is missing.")
         return []
 
-    url = f"https://newsapi.org/v2/everything?q={query}&apiKey={NEWS_API_KEY}&pageSize={num_results}"
-    
+    import requests
     try:
-        response = requests.get(url)
+        response = requests.get(NEWSAPI_URL, params={"q": query, "apiKey": NEWS_API_KEY, "pageSize": num_results})
         response.raise_for_status()
-        data = response.json()
-
-        return [
-            {"title": article["title"], "url": article["url"]}
-            for article in data.get("articles", [])  # Ensure "articles" exist
-        ]
+        return _parse_newsapi(response.json())
 
     except requests.RequestException as e:
-        print(f"❌ Error fetching NewsAPI: {e}")
+        print(f"❌ Error fetching NewsAPI: {describe_error(e)}")
+        return []
+
+async def fetch_newsapi(query: str, num_results=5):
+    """Async NewsAPI search on the shared pooled client. Raises on failure."""
+    response = await fetch(NEWSAPI_URL, params={"q": query, "apiKey": NEWS_API_KEY, "pageSize": num_results})
+    return _parse_newsapi(response.json())
+
+async def asearch_newsapi(query: str, num_results=5):
+    """Async NewsAPI search on the shared pooled client."""
+    if not NEWS_API_KEY:
+        print("❌ Error: NewsAPI key is missing.")
+        return []
+
+    try:
+        return await fetch_newsapi(query, num_results)
+
+    except httpx.HTTPError as e:
+        print(f"❌ Error fetching NewsAPI: {describe_error(e)}")
         return []
 
-newsapi_tool = Tool(
-    name="NewsAPI Search",
-    description="Fetch the latest news articles related to a topic.",
-    func=search_newsapi
-)
 
 # ✅ Arxiv Research Paper Search Tool
-def search_arxiv(query: str, num_results=5):
-    url = f"http://export.arxiv.org/api/query?search_query=all:{query}&start=0&max_results={num_results}"
+def _arxiv_params(query, num_results):
+    return {"search_query": f"all:{query}", "start": 0, "max_results": num_results}
 
+def search_arxiv(query: str, num_results=5):
+    import requests
     try:
-        response = requests.get(url)
+        response = requests.get(ARXIV_URL, params=_arxiv_params(query, num_results))
         response.raise_for_status()
-        data = response.text.split("<entry>")
-        papers = []
+        return parse_arxiv_feed(response.content, num_results)
 
-        for entry in data[1:num_results+1]:  
-            title = entry.split("<title>")[1].split("</title>")[0].strip()
-            link = entry.split("<id>")[1].split("</id>")[0].strip()
-            papers.append({"title": title, "url": link})
+    except (requests.RequestException, ET.ParseError) as e:
+        print(f"❌ Error fetching Arxiv: {e}")
+        return []
 
-        return papers
+async def fetch_arxiv(query: str, num_results=5):
+    """Async Arxiv search on the shared pooled client, parsing entries as bytes arrive. Raises on failure."""
+    parser = ArxivFeedParser(num_results)
+    papers = []
+    async with stream(ARXIV_URL, params=_arxiv_params(query, num_results)) as response:
+        async for chunk in response.aiter_bytes():
+            # Once all entries are in, keep reading the closing tags: a response closed
+            # half-read cannot go back to the pool, and the next call would reconnect
+            if not parser.done:
+                papers += parser.feed(chunk)
+    return papers if parser.done else papers + parser.close()
 
-    except requests.RequestException as e:
+async def asearch_arxiv(query: str, num_results=5):
+    """Async Arxiv search on the shared pooled client."""
+    try:
+        return await fetch_arxiv(query, num_results)
+
+    except (httpx.HTTPError, ET.ParseError) as e:
         print(f"❌ Error fetching Arxiv: {e}")
         return []
 
-arxiv_tool = Tool(
-    name="Arxiv Paper Search",
-    description="Fetch the latest AI research papers from Arxiv.",
-    func=search_arxiv
-)
+# ✅ LangChain Tool wrappers, built on first access so importing this module stays cheap
+_TOOL_SPECS = {
+    "wikipedia_tool": dict(
+        name="Wikipedia Search",
+        description="Fetch structured summaries from Wikipedia for a given topic.",
+        func=search_wikipedia,
+        coroutine=asearch_wikipedia
+    ),
+    "hackernews_tool": dict(
+        name="Hacker News Search",
+        description="Find trending discussions from Hacker News related to a topic.",
+        func=search_hackernews,
+        coroutine=asearch_hackernews
+    ),
+    "newsapi_tool": dict(
+        name="NewsAPI Search",
+        description="Fetch the latest news articles related to a topic.",
+        func=search_newsapi,
+        coroutine=asearch_newsapi
+    ),
+    "arxiv_tool": dict(
+        name="Arxiv Paper Search",
+        description="Fetch the latest AI research papers from Arxiv.",
+        func=search_arxiv,
+        coroutine=asearch_arxiv
+    ),
+}
+
+def __getattr__(name):
+    if name in _TOOL_SPECS:
+        from langchain_core.tools import Tool
+        tool = Tool(**_TOOL_SPECS[name])
+        globals()[name] = tool
+        return tool
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
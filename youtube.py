@@ -1,53 +1,127 @@
+import json
 import os
-from googleapiclient.discovery import build
+import threading
+import httpx
 from dotenv import load_dotenv
-from langchain_core.tools import Tool
+
+from http_client import fetch
+from resilience import describe_error
 
 # Load environment variables
 load_dotenv()
 YOUTUBE_API_KEY = os.getenv("YOUTUBE_API_KEY")
 
+# Optional on-disk copy of the discovery document; falls back to the one bundled with googleapiclient
+YOUTUBE_DISCOVERY_PATH = os.getenv("YOUTUBE_DISCOVERY_PATH", "")
+YOUTUBE_SEARCH_URL = os.getenv("YOUTUBE_SEARCH_URL", "https://www.googleapis.com/youtube/v3/search")
+
+_discovery_doc = None
+_discovery_lock = threading.Lock()
+_local = threading.local()
+
+
+def _load_discovery_doc():
+    """Reads and parses the YouTube v3 discovery document once, without touching the network."""
+    global _discovery_doc
+    with _discovery_lock:
+        if _discovery_doc is None:
+            if YOUTUBE_DISCOVERY_PATH and os.path.exists(YOUTUBE_DISCOVERY_PATH):
+                with open(YOUTUBE_DISCOVERY_PATH, encoding="utf-8") as f:
+                    _discovery_doc = json.load(f)
+            else:
+                from googleapiclient.discovery_cache import get_static_doc
+                _discovery_doc = json.loads(get_static_doc("youtube", "v3"))
+    return _discovery_doc
+
+
+def get_youtube_service():
+    """Returns this thread's service object (httplib2 is not thread-safe, so one per thread)."""
+    service = getattr(_local, "service", None)
+    if service is None:
+        from googleapiclient.discovery import build_from_document
+        service = build_from_document(_load_discovery_doc(), developerKey=YOUTUBE_API_KEY)
+        _local.service = service
+    return service
+
+
+def _parse_videos(search_response):
+    videos = []
+    for item in search_response.get("items", []):
+        video_title = item["snippet"]["title"]
+        video_id = item["id"]["videoId"]
+        video_url = f"https://www.youtube.com/watch?v={video_id}"
+        channel_name = item["snippet"]["channelTitle"]
+        publish_date = item["snippet"]["publishedAt"]
+        thumbnail_url = item["snippet"]["thumbnails"]["high"]["url"]
+
+        videos.append({
+            "title": video_title,
+            "url": video_url,
+            "channel": channel_name,
+            "published_at": publish_date,
+            "thumbnail": thumbnail_url
+        })
+
+    return videos
+
+
 def search_youtube_videos(query: str, max_results=5):
     """Search YouTube for videos related to the query and return structured data."""
     if not YOUTUBE_API_KEY:
         print("❌ Error: YouTube API Key not found. Set it in your .env file.")
         return []
 
-    youtube = build("youtube", "v3", developerKey=YOUTUBE_API_KEY)
-
     try:
-        search_response = youtube.search().list(
+        search_response = get_youtube_service().search().list(
             q=query,
             part="snippet",
             type="video",
             maxResults=max_results
         ).execute()
 
-        videos = []
-        for item in search_response.get("items", []):
-            video_title = item["snippet"]["title"]
-            video_id = item["id"]["videoId"]
-            video_url = f"https://www.youtube.com/watch?v={video_id}"
-            channel_name = item["snippet"]["channelTitle"]
-            publish_date = item["snippet"]["publishedAt"]
-            thumbnail_url = item["snippet"]["thumbnails"]["high"]["url"]
-
-            videos.append({
-                "title": video_title,
-                "url": video_url,
-                "channel": channel_name,
-                "published_at": publish_date,
-                "thumbnail": thumbnail_url
-            })
-
-        return videos
+        return _parse_videos(search_response)
 
     except Exception as e:
-        print(f"❌ YouTube API Error: {e}")
+        print(f"❌ YouTube API Error: {describe_error(e)}")
         return []
 
-youtube_search_tool = Tool(
-    name="YouTube Video Search",
-    description="Searches for top YouTube videos related to a given topic.",
-    func=search_youtube_videos
-)
+
+async def fetch_youtube_videos(query: str, max_results=5):
+    """Async YouTube search against the REST endpoint on the shared pooled client. Raises on failure."""
+    response = await fetch(YOUTUBE_SEARCH_URL, params={
+        "q": query,
+        "part": "snippet",
+        "type": "video",
+        "maxResults": max_results,
+        "key": YOUTUBE_API_KEY,
+    })
+    return _parse_videos(response.json())
+
+
+async def asearch_youtube_videos(query: str, max_results=5):
+    """Async YouTube search against the REST endpoint on the shared pooled client."""
+    if not YOUTUBE_API_KEY:
+        print("❌ Error: YouTube API Key not found. Set it in your .env file.")
+        return []
+
+    try:
+        return await fetch_youtube_videos(query, max_results)
+
+    except (httpx.HTTPError, KeyError) as e:
+        print(f"❌ YouTube API Error: {describe_error(e)}")
+        return []
+
+
+def __getattr__(name):
+    # The LangChain Tool wrapper is built on first access so importing this module stays cheap
+    if name == "youtube_search_tool":
+        from langchain_core.tools import Tool
+        tool = Tool(
+            name="YouTube Video Search",
+            description="Searches for top YouTube videos related to a given topic.",
+            func=search_youtube_videos,
+            coroutine=asearch_youtube_videos
+        )
+        globals()[name] = tool
+        return tool
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")